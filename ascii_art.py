@@ -6,8 +6,26 @@
 """Text to ASCII Art Generator with 24-bit color."""
 
 import argparse
+import asyncio
+import bisect
+import contextlib
+import copy
+import cProfile
+import functools
+import importlib.resources
+import itertools
+import json
 import math
+import os
+import pickle
+import pstats
+import re
 import sys
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Sequence, TextIO
 
 import pyfiglet
 
@@ -73,41 +91,365 @@ def multi_stop_lerp(
     return lerp_rgb(colors[i], colors[i + 1], local)
 
 
+# ============================================================
+# Instrumentation — per-stage timers and counters for --stats / --profile
+# ============================================================
+
+# Functions shown in the --profile report
+PROFILE_LINES = 25
+
+
+class Stats:
+    """Wall time per named stage, plus counters such as cells and escapes.
+
+    Stages nest, and time spent in an inner stage isn't counted in the outer
+    one, so stage times add up to at most the wall time. While disabled (the
+    default) stage() returns a shared no-op and count() returns immediately.
+    Only the main thread records stages.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.times: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self._stack: list[list] = []  # [name, start of its not yet counted time]
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager:
+        return self._timed(name) if self.enabled else _NO_STAGE
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1])
+        entry = [name, now]
+        self._stack.append(entry)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._stack.pop()
+            self._add(name, now - entry[1])
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def _add(self, name: str, seconds: float) -> None:
+        self.times[name] = self.times.get(name, 0.0) + seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "stages": {name: {"seconds": t, "calls": self.calls.get(name, 0)} for name, t in self.times.items()},
+            "counters": dict(self.counters),
+        }
+
+    def merge(self, snapshot: dict) -> None:
+        """Fold in a snapshot taken elsewhere (e.g. by a batch worker)."""
+        for name, stage in snapshot["stages"].items():
+            self._add(name, stage["seconds"])
+            self.calls[name] = self.calls.get(name, 0) + stage["calls"]
+        for name, n in snapshot["counters"].items():
+            self.count(name, n)
+
+    def report(self, fmt: str, wall: float, out: TextIO | None = None) -> None:
+        """Print the stages (slowest first, then untimed "other") and counters as text or JSON."""
+        out = out or sys.stderr
+        if fmt == "json":
+            print(json.dumps({**self.snapshot(), "wall_seconds": wall}, indent=2), file=out)
+            return
+        other = max(0.0, wall - sum(self.times.values()))
+        rows = sorted(self.times.items(), key=lambda item: -item[1]) + [("other", other)]
+        print(f"{'stage':<10} {'time':>10} {'share':>6} {'calls':>7}", file=out)
+        for name, seconds in rows:
+            share = seconds / wall if wall else 0.0
+            print(f"{name:<10} {seconds * 1000:>8.1f}ms {share:>6.1%} {self.calls.get(name, ''):>7}", file=out)
+        print(f"{'total':<10} {wall * 1000:>8.1f}ms", file=out)
+        for name, n in self.counters.items():
+            print(f"{name:<10} {n:>10,}", file=out)
+
+
+STATS = Stats()
+_NO_STAGE = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def instrumented(stats: str | None = None, profile: str | None = None) -> Iterator[None]:
+    """Run the body with STATS enabled and/or under cProfile, reporting both to stderr at the end.
+
+    stats is "text" or "json". profile is "-" for the report alone, or a path
+    that also gets the raw profile (for pstats or snakeviz).
+    """
+    STATS.enabled = stats is not None
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+            if profile != "-":
+                profiler.dump_stats(profile)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        if stats:
+            STATS.report(stats, wall)
+
+
+# ============================================================
+# Output encoding — emit an escape only when the color changes
+# ============================================================
+
+
+def quantize_rgb(rgb: tuple[int, int, int], step: int) -> tuple[int, int, int]:
+    """Snap channels to the center of a grid of `step` so near colors share escapes."""
+    if step <= 1:
+        return rgb
+    return tuple(min(c // step * step + step // 2, 255) for c in rgb)
+
+
+def encode_line(line: str, escapes: Sequence[str | None]) -> str:
+    """Color each character of `line`, re-emitting its fg escape only when it changes.
+
+    escapes[i] is the escape for line[i] (None leaves it uncolored); spaces are
+    never colored. A single RESET closes the line if any color was set.
+    """
+    out = []
+    current = None
+    for ch, esc in zip(line, escapes):
+        if ch != " " and esc is not None and esc != current:
+            out.append(esc)
+            current = esc
+        out.append(ch)
+    if current is not None:
+        out.append(RESET)
+    return "".join(out)
+
+
+# ============================================================
+# Palette output — 256 and 16 colors for terminals without true color
+# ============================================================
+
+COLOR_DEPTHS = (24, 256, 16)
+DITHER_MODES = ("none", "ordered", "fs")
+
+# xterm's default colors 0-15
+PALETTE_16 = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+_LEVELS = (0, 95, 135, 175, 215, 255)
+
+# Color number -> rgb. 256-color output only picks from the 6x6x6 cube and
+# the gray ramp (16-255), since terminals let users redefine the first 16.
+PALETTES = {
+    16: dict(enumerate(PALETTE_16)),
+    256: {
+        **{16 + 36 * r + 6 * g + b: (_LEVELS[r], _LEVELS[g], _LEVELS[b]) for r in range(6) for g in range(6) for b in range(6)},
+        **{232 + i: (8 + 10 * i,) * 3 for i in range(24)},
+    },
+}
+
+# Ordered dithering: 4x4 Bayer thresholds, scaled to about one palette step
+BAYER_4 = ((0, 8, 2, 10), (12, 4, 14, 6), (3, 11, 1, 9), (15, 7, 13, 5))
+DITHER_SPREAD = {256: 40, 16: 128}
+
+
+def check_color_depth(depth: int, dither: str = "none") -> None:
+    if depth not in COLOR_DEPTHS:
+        raise ValueError(f"unknown color depth {depth} (use 24, 256 or 16)")
+    if dither not in DITHER_MODES:
+        raise ValueError(f'unknown dither "{dither}" (use none, ordered or fs)')
+
+
+@functools.lru_cache(maxsize=None)
+def _cube_cell(depth: int, r: int, g: int, b: int) -> int:
+    """Nearest palette color to the center of cell (r, g, b) of a 32x32x32 lookup cube.
+
+    Cells are filled in on first use, so a banner's few hundred colors never
+    pay for a palette search more than once.
+    """
+    center = (r * 8 + 4, g * 8 + 4, b * 8 + 4)
+
+    def distance(item: tuple[int, tuple[int, int, int]]) -> int:
+        (pr, pg, pb), (cr, cg, cb) = item[1], center
+        # Weighted toward green, a cheap stand-in for perceived difference
+        return 2 * (pr - cr) ** 2 + 4 * (pg - cg) ** 2 + 3 * (pb - cb) ** 2
+
+    return min(PALETTES[depth].items(), key=distance)[0]
+
+
+def palette_number(rgb: Sequence[float], depth: int) -> int:
+    r, g, b = (min(max(int(c), 0), 255) for c in rgb)
+    return _cube_cell(depth, r >> 3, g >> 3, b >> 3)
+
+
+def palette_fg(number: int, depth: int) -> str:
+    if depth == 256:
+        return f"\x1b[38;5;{number}m"
+    return f"\x1b[{30 + number if number < 8 else 82 + number}m"
+
+
+def color_escape(rgb: tuple[int, int, int], quantize: int = 1, depth: int = 24) -> str:
+    """fg escape for `rgb`: 24-bit (snapped to `quantize`), or the nearest palette color."""
+    if depth == 24:
+        return fg(*quantize_rgb(rgb, quantize))
+    return palette_fg(palette_number(rgb, depth), depth)
+
+
+def dithered_escapes(grid: Sequence[Sequence[tuple[int, int, int]]], depth: int, dither: str) -> list[list[str]]:
+    """fg escapes for a grid of colors, dithered onto the palette (ordered or fs)."""
+    palette = PALETTES[depth]
+    spread = DITHER_SPREAD[depth]
+    out = []
+    if dither == "ordered":
+        for y, row in enumerate(grid):
+            thresholds = [((t + 0.5) / 16 - 0.5) * spread for t in BAYER_4[y % 4]]
+            out.append([
+                palette_fg(palette_number([c + thresholds[x % 4] for c in rgb], depth), depth)
+                for x, rgb in enumerate(row)
+            ])
+        return out
+    # Floyd-Steinberg: 7/16 of the error to the right, 3/16, 5/16 and 1/16 below
+    cols = max((len(row) for row in grid), default=0)
+    below = [[0.0, 0.0, 0.0] for _ in range(cols + 2)]
+    for row in grid:
+        here, below = below, [[0.0, 0.0, 0.0] for _ in range(cols + 2)]
+        line = []
+        for x, rgb in enumerate(row):
+            want = [min(max(c + e, 0.0), 255.0) for c, e in zip(rgb, here[x + 1])]
+            number = palette_number(want, depth)
+            line.append(palette_fg(number, depth))
+            for i, err in enumerate(w - p for w, p in zip(want, palette[number])):
+                here[x + 2][i] += err * 7 / 16
+                below[x][i] += err * 3 / 16
+                below[x + 1][i] += err * 5 / 16
+                below[x + 2][i] += err / 16
+        out.append(line)
+    return out
+
+
 # ============================================================
 # Gradient engine
 # ============================================================
 
 
+def gradient_color(
+    colors: Sequence[tuple[int, int, int]], direction: str, row: int, col: int, rows: int, cols: int
+) -> tuple[int, int, int]:
+    """Color of cell (row, col) in a rows x cols gradient."""
+    if direction == "h":
+        t = col / (cols - 1) if cols > 1 else 0
+    elif direction == "v":
+        t = row / (rows - 1) if rows > 1 else 0
+    elif direction == "d":
+        denom = cols + rows - 2
+        t = (row + col) / denom if denom > 0 else 0
+    elif direction == "r":
+        cx, cy = (cols - 1) / 2, (rows - 1) / 2
+        max_r = math.sqrt(cx * cx + cy * cy) or 1
+        t = math.sqrt((col - cx) ** 2 + (row - cy) ** 2) / max_r
+    else:
+        t = col / (cols - 1) if cols > 1 else 0
+    return multi_stop_lerp(colors, t)
+
+
+def gradient_cells(direction: str, rows: int, cols: int, values: Callable[[list[float]], list]) -> list[list]:
+    """Per-cell values of a rows x cols gradient, from one `values(ts)` call over the distinct t.
+
+    t is as in gradient_color(). Cells share a t along a column of a
+    horizontal gradient, a row of a vertical one, a diagonal of a diagonal one
+    and a distance from the center of a radial one. Squared distances mirror
+    exactly across the center. Rows are then slices of the diagonal, or lookups
+    by squared distance, instead of math per cell.
+    """
+    if direction == "v":
+        return [[value] * cols for value in values([row / (rows - 1) if rows > 1 else 0 for row in range(rows)])]
+    if direction == "d":
+        denom = cols + rows - 2
+        diagonal = values([k / denom if denom > 0 else 0 for k in range(rows + cols - 1)])
+        return [diagonal[row : row + cols] for row in range(rows)]
+    if direction == "r":
+        cx, cy = (cols - 1) / 2, (rows - 1) / 2
+        max_r = math.sqrt(cx * cx + cy * cy) or 1
+        # One quadrant, mirrored: the other three have the same squared distances
+        dx2 = [(col - cx) ** 2 for col in range((cols + 1) // 2)]
+        keys = [[d + (row - cy) ** 2 for d in dx2] for row in range((rows + 1) // 2)]
+        distances = list(dict.fromkeys(itertools.chain.from_iterable(keys)))
+        by_distance = dict(zip(distances, values([math.sqrt(d) / max_r for d in distances])))
+        top = [left + left[: cols // 2][::-1] for left in ([by_distance[d] for d in row] for row in keys)]
+        return top + top[: rows // 2][::-1]
+    line = values([col / (cols - 1) if cols > 1 else 0 for col in range(cols)])
+    return [line] * rows
+
+
+def multi_stop_lerp_all(colors: Sequence[tuple[int, int, int]], ts: list[float]) -> list[tuple[int, int, int]]:
+    """multi_stop_lerp() for many t at once, with the same arithmetic and so the same colors."""
+    if len(colors) == 1:
+        return [colors[0]] * len(ts)
+    n = len(colors) - 1
+    segments = [(0.0 if t < 0.0 else 1.0 if t > 1.0 else t) * n for t in ts]
+    return [
+        (round(r0 + (r1 - r0) * local), round(g0 + (g1 - g0) * local), round(b0 + (b1 - b0) * local))
+        for segment in segments
+        for i in (int(segment) if segment < n else n - 1,)
+        for local in (segment - i,)
+        for (r0, g0, b0), (r1, g1, b1) in ((colors[i], colors[i + 1]),)
+    ]
+
+
+@functools.lru_cache(maxsize=256)
+def compile_gradient(
+    colors: tuple[tuple[int, int, int], ...],
+    direction: str,
+    rows: int,
+    cols: int,
+    quantize: int = 1,
+    depth: int = 24,
+    dither: str = "none",
+) -> tuple[tuple[str, ...], ...]:
+    """Ready-made fg escapes for every cell of a rows x cols gradient.
+
+    Colors are computed once per distinct t (see gradient_cells()) and escapes
+    once per distinct color.
+    Dithered palette escapes depend on position, so they are picked per cell
+    from the color grid.
+    """
+    if depth != 24 and dither != "none":
+        grid = gradient_cells(direction, rows, cols, functools.partial(multi_stop_lerp_all, colors))
+        return tuple(tuple(line) for line in dithered_escapes(grid, depth, dither))
+
+    def escapes(ts: list[float]) -> list[str]:
+        rgbs = multi_stop_lerp_all(colors, ts)
+        by_rgb = {rgb: color_escape(rgb, quantize, depth) for rgb in set(rgbs)}
+        return [by_rgb[rgb] for rgb in rgbs]
+
+    return tuple(map(tuple, gradient_cells(direction, rows, cols, escapes)))
+
+
 def apply_gradient(
-    text: str, colors: list[tuple[int, int, int]], direction: str
+    text: str,
+    colors: Sequence[tuple[int, int, int]],
+    direction: str,
+    quantize: int = 1,
+    depth: int = 24,
+    dither: str = "none",
 ) -> str:
     lines = text.split("\n")
     rows = len(lines)
     cols = max((len(l) for l in lines), default=1) or 1
-    out = []
-    for row, line in enumerate(lines):
-        chars = []
-        for col, ch in enumerate(line):
-            if ch == " ":
-                chars.append(ch)
-                continue
-            if direction == "h":
-                t = col / (cols - 1) if cols > 1 else 0
-            elif direction == "v":
-                t = row / (rows - 1) if rows > 1 else 0
-            elif direction == "d":
-                denom = cols + rows - 2
-                t = (row + col) / denom if denom > 0 else 0
-            elif direction == "r":
-                cx, cy = (cols - 1) / 2, (rows - 1) / 2
-                max_r = math.sqrt(cx * cx + cy * cy) or 1
-                t = math.sqrt((col - cx) ** 2 + (row - cy) ** 2) / max_r
-            else:
-                t = col / (cols - 1) if cols > 1 else 0
-            r, g, b = multi_stop_lerp(colors, t)
-            chars.append(f"{fg(r, g, b)}{ch}{RESET}")
-        out.append("".join(chars))
-    return "\n".join(out)
+    table = compile_gradient(tuple(colors), direction, rows, cols, quantize, depth, dither)
+    return "\n".join(encode_line(line, escapes) for line, escapes in zip(lines, table))
 
 
 # ============================================================
@@ -218,7 +560,7 @@ def _parse_letter_color(spec: str) -> dict:
     if spec in PRESETS:
         preset = PRESETS[spec]
         d = direction if has_dir else preset["dir"]
-        return {"type": "gradient", "colors": preset["colors"], "dir": d}
+        return {"type": "gradient", "colors": tuple(preset["colors"]), "dir": d}
 
     import re
 
@@ -226,77 +568,143 @@ def _parse_letter_color(spec: str) -> dict:
         return {"type": "solid", "rgb": hex_to_rgb(spec)}
 
     if "-" in spec and "#" in spec:
-        stops = [hex_to_rgb(s.strip()) for s in spec.split("-")]
+        stops = tuple(hex_to_rgb(s.strip()) for s in spec.split("-"))
         return {"type": "gradient", "colors": stops, "dir": direction}
 
     return {"type": "solid", "rgb": (255, 255, 255)}
 
 
-def _resolve_letter_color(
-    lc: dict, row: int, local_col: int, total_rows: int, letter_cols: int
-) -> tuple[int, int, int]:
-    """Get RGB for a character at (row, local_col) within a letter's column span."""
+def _letter_escapes(
+    lc: dict,
+    row: int,
+    start: int,
+    stop: int,
+    total_rows: int,
+    letter_cols: int,
+    quantize: int,
+    depth: int = 24,
+    dither: str = "none",
+) -> list[str]:
+    """fg escapes for columns start..stop-1 of `row`, relative to a letter's column span."""
     if lc["type"] == "solid":
-        return lc["rgb"]
+        return [color_escape(lc["rgb"], quantize, depth)] * (stop - start)
 
-    colors = lc["colors"]
-    direction = lc["dir"]
+    def outside(local_col: int) -> str:
+        # Outside the span (wrapped output) — extrapolate like the gradient math does
+        rgb = gradient_color(lc["colors"], lc["dir"], row, local_col, total_rows, letter_cols)
+        return color_escape(rgb, quantize, depth)
 
-    if direction == "h":
-        t = local_col / (letter_cols - 1) if letter_cols > 1 else 0
-    elif direction == "v":
-        t = row / (total_rows - 1) if total_rows > 1 else 0
-    elif direction == "d":
-        denom = letter_cols + total_rows - 2
-        t = (row + local_col) / denom if denom > 0 else 0
-    elif direction == "r":
-        cx = (letter_cols - 1) / 2
-        cy = (total_rows - 1) / 2
-        max_r = math.sqrt(cx * cx + cy * cy) or 1
-        t = math.sqrt((local_col - cx) ** 2 + (row - cy) ** 2) / max_r
-    else:
-        t = local_col / (letter_cols - 1) if letter_cols > 1 else 0
+    lo, hi = max(start, 0), min(stop, letter_cols)
+    inside = []
+    if lo < hi:
+        table = compile_gradient(lc["colors"], lc["dir"], total_rows, letter_cols, quantize, depth, dither)
+        inside = table[row][lo:hi]
+    before = [outside(col) for col in range(start, min(stop, 0))]
+    after = [outside(col) for col in range(max(start, letter_cols, 0), stop)]
+    return [*before, *inside, *after]
+
+
+def _justified_width(n: int, justify: str, width: int) -> int:
+    """Length of an n-column row after pyfiglet's justifyString()."""
+    if justify == "right":
+        return n + max(width - n - 1, 0)
+    if justify == "center":
+        return n + max(int((width - n) / 2), 0)
+    return n
 
-    return multi_stop_lerp(colors, t)
+
+def letter_boundaries(text: str, font: str, width: int, hlayout: str = "default") -> list[int]:
+    """boundaries[i] = rendered width of figlet_format(text[:i]), in one layout pass.
+
+    A prefix render is exactly the state pyfiglet's builder is in the first
+    time its iterator reaches the end of that prefix (wrapping may move it
+    back later), so we run the builder once over the whole text and measure it
+    at each of those points instead of re-rendering every prefix.
+    """
+    with STATS.stage("boundaries"):
+        return _letter_boundaries(text, font, width, hlayout)
+
+
+def _letter_boundaries(text: str, font: str, width: int, hlayout: str) -> list[int]:
+    fig = CachedFiglet(font=font, width=width, hlayout=hlayout)
+
+    def rows_width(rows: list[str], justify: str) -> int:
+        return max((_justified_width(len(r), justify, width) for r in rows), default=0)
+
+    boundaries = [0]
+    flushed_w = 0  # widest row already flushed to the product by wrapping
+    flushed = 0
+
+    def measure(builder: pyfiglet.FigletBuilder) -> bool:
+        nonlocal flushed_w, flushed
+        queue = builder.product.queue
+        for done in queue[flushed:]:
+            flushed_w = max(flushed_w, rows_width(done, builder.justify))
+        flushed = len(queue)
+        if builder.iterator == len(boundaries):
+            current = rows_width(builder.buffer, builder.justify) if builder.buffer[0] != "" else 0
+            boundaries.append(max(flushed_w, current))
+        return False
+
+    layout(fig, text, measure)
+    return boundaries
 
 
 def apply_per_letter(
-    rendered: str, input_text: str, specs_str: str, font: str, width: int
+    rendered: str,
+    input_text: str,
+    specs_str: str,
+    font: str,
+    width: int,
+    quantize: int = 1,
+    hlayout: str = "default",
+    depth: int = 24,
+    dither: str = "none",
 ) -> str:
     """Color each input character's figlet columns with its own color spec."""
     specs_raw = [s.strip() for s in specs_str.split(",")]
     letter_colors = [_parse_letter_color(s) for s in specs_raw]
-
-    # Compute column boundaries via progressive rendering
-    boundaries = [0]
-    for i in range(1, len(input_text) + 1):
-        r = pyfiglet.figlet_format(input_text[:i], font=font, width=width)
-        max_w = max((len(line) for line in r.rstrip("\n").split("\n")), default=0)
-        boundaries.append(max_w)
+    boundaries = letter_boundaries(input_text, font, width, hlayout)
 
     lines = rendered.split("\n")
     rows = len(lines)
-    out = []
+    cols = max((len(line) for line in lines), default=0)
+
+    # Column -> input letter: the first letter whose end lies past the column.
+    # Ends can shrink when prefixes wrap, so search their running maximum.
+    ends = list(itertools.accumulate(boundaries[1:], max))
+    last = len(boundaries) - 2
+    col_letter = [min(bisect.bisect_right(ends, col), last) for col in range(cols)]
+
+    # col_letter never decreases, so each letter owns one run of columns
+    runs = []
+    for letter, group in itertools.groupby(range(cols), col_letter.__getitem__):
+        first = next(group)
+        runs.append((letter, first, first + 1 + sum(1 for _ in group)))
+
+    spans = []
+    for i in range(len(boundaries) - 1):
+        start_col = boundaries[i]
+        end_col = boundaries[i + 1]
+        lc = letter_colors[i % len(letter_colors)]
+        table = None
+        if lc["type"] != "solid" and end_col > start_col:
+            table = compile_gradient(lc["colors"], lc["dir"], rows, end_col - start_col, quantize, depth, dither)
+        spans.append((start_col, end_col - start_col, lc, table))
 
+    out = []
     for row, line in enumerate(lines):
-        chars = []
-        for col, ch in enumerate(line):
-            if ch == " ":
-                chars.append(ch)
-                continue
-            # Find which input letter this column belongs to
-            letter_idx = len(boundaries) - 2
-            for i in range(len(boundaries) - 1):
-                if col < boundaries[i + 1]:
-                    letter_idx = i
-                    break
-            lc = letter_colors[letter_idx % len(letter_colors)]
-            start_col = boundaries[letter_idx]
-            end_col = boundaries[min(letter_idx + 1, len(boundaries) - 1)]
-            letter_w = end_col - start_col
-            r, g, b = _resolve_letter_color(lc, row, col - start_col, rows, letter_w)
-            chars.append(f"{fg(r, g, b)}{ch}{RESET}")
-        out.append("".join(chars))
+        escapes = []
+        for letter, first, end in runs:
+            if first >= len(line):
+                break
+            start_col, letter_w, lc, table = spans[letter]
+            lo, hi = first - start_col, min(end, len(line)) - start_col
+            if table is not None and 0 <= lo and hi <= letter_w:
+                escapes += table[row][lo:hi]
+            else:
+                escapes += _letter_escapes(lc, row, lo, hi, rows, letter_w, quantize, depth, dither)
+        out.append(encode_line(line, escapes))
 
     return "\n".join(out)
 
@@ -306,9 +714,13 @@ def apply_per_letter(
 # ============================================================
 
 
-def parse_color_spec(spec: str):
+def no_color(text: str) -> str:
+    return text
+
+
+def parse_color_spec(spec: str, quantize: int = 1, depth: int = 24, dither: str = "none"):
     if not spec or spec == "none":
-        return lambda t: t
+        return no_color
 
     # Per-letter coloring
     if spec.startswith("letter:"):
@@ -331,22 +743,206 @@ def parse_color_spec(spec: str):
     if spec in PRESETS:
         preset = PRESETS[spec]
         d = direction if has_dir else preset["dir"]
-        return lambda t, p=preset, dd=d: apply_gradient(t, p["colors"], dd)
+        return lambda t, p=preset, dd=d: apply_gradient(t, p["colors"], dd, quantize, depth, dither)
 
     # Single hex
     import re
 
     if re.match(r"^#[0-9a-fA-F]{3,6}$", spec):
-        r, g, b = hex_to_rgb(spec)
-        return lambda t, r=r, g=g, b=b: f"{fg(r, g, b)}{t}{RESET}"
+        esc = color_escape(hex_to_rgb(spec), depth=depth)
+        return lambda t, e=esc: f"{e}{t}{RESET}"
 
     # Hex gradient: #aaa-#bbb-#ccc
     if "-" in spec and "#" in spec:
         stops = [hex_to_rgb(s.strip()) for s in spec.split("-")]
-        return lambda t, s=stops, d=direction: apply_gradient(t, s, d)
+        return lambda t, s=stops, d=direction: apply_gradient(t, s, d, quantize, depth, dither)
 
     print(f'Unknown color: "{spec}". Use --colors to list options.', file=sys.stderr)
-    return lambda t: t
+    return no_color
+
+
+def colorize_banner(
+    rendered: str,
+    text: str,
+    colorize,
+    font: str,
+    width: int,
+    quantize: int = 1,
+    hlayout: str = "default",
+    depth: int = 24,
+    dither: str = "none",
+) -> str:
+    """Apply a parse_color_spec() result to a rendered banner."""
+    with STATS.stage("colorize"):
+        if isinstance(colorize, dict) and colorize.get("type") == "letter":
+            return apply_per_letter(rendered, text, colorize["specs"], font, width, quantize, hlayout, depth, dither)
+        return colorize(rendered)
+
+
+# ============================================================
+# Font cache — font list and parsed FIGfonts, kept on disk
+# ============================================================
+
+FONT_CACHE_VERSION = 1
+
+
+def cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ascii_art")
+
+
+def _stamp(paths: list[str]) -> tuple | None:
+    """Cache key for a set of files/directories: mtimes and sizes, or None if unstattable."""
+    try:
+        stats = [os.stat(path) for path in paths]
+    except OSError:
+        return None
+    return (
+        FONT_CACHE_VERSION,
+        pyfiglet.__version__,
+        tuple((path, st.st_mtime_ns, st.st_size) for path, st in zip(paths, stats)),
+    )
+
+
+def _cache_path(name: str) -> str:
+    return os.path.join(cache_dir(), urllib.parse.quote(name, safe="") + ".pickle")
+
+
+def _cache_load(name: str, stamp: tuple):
+    """Cached value for `name` if it was stored under the same stamp, else None."""
+    try:
+        with open(_cache_path(name), "rb") as f:
+            cached_stamp, value = pickle.load(f)
+    except Exception:
+        return None  # missing, unreadable or from an incompatible version
+    return value if cached_stamp == stamp else None
+
+
+def _cache_store(name: str, stamp: tuple, value) -> None:
+    path = _cache_path(name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((stamp, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # the cache is best-effort
+
+
+def _font_dirs() -> list[str]:
+    dirs = [str(importlib.resources.files("pyfiglet.fonts"))]
+    if os.path.isdir(pyfiglet.SHARED_DIRECTORY):
+        dirs.append(pyfiglet.SHARED_DIRECTORY)
+    return dirs
+
+
+def _font_file(name: str) -> str | None:
+    """Path pyfiglet would load `name` from (same search order as preloadFont)."""
+    for ext in ("tlf", "flf"):
+        fn = f"{name}.{ext}"
+        path = os.path.join(_font_dirs()[0], fn)
+        if os.path.isfile(path):
+            return path
+        for location in ("./", pyfiglet.SHARED_DIRECTORY):
+            path = os.path.join(location, fn)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def list_fonts() -> list[str]:
+    """All font names. Rescans only when a font directory changes."""
+    stamp = _stamp(_font_dirs())
+    fonts = _cache_load("fonts", stamp) if stamp else None
+    if fonts is None:
+        fonts = sorted(pyfiglet.FigletFont.getFonts())
+        if stamp:
+            _cache_store("fonts", stamp, fonts)
+    return fonts
+
+
+@functools.lru_cache(maxsize=64)
+def load_font(name: str) -> pyfiglet.FigletFont:
+    """Parsed FigletFont, unpickled from the cache while its file is unchanged."""
+    with STATS.stage("font"):
+        path = _font_file(name)
+        stamp = _stamp([path]) if path else None
+        state = _cache_load(f"font-{name}", stamp) if stamp else None
+        if state is not None:
+            font = pyfiglet.FigletFont.__new__(pyfiglet.FigletFont)
+            font.__dict__.update(state, data="")
+            return font
+        font = pyfiglet.FigletFont(name)  # raises FontNotFound
+        if stamp:
+            _cache_store(f"font-{name}", stamp, {k: v for k, v in font.__dict__.items() if k != "data"})
+        return font
+
+
+# FIGfont smush mode bits (see pyfiglet.FigletBuilder)
+SM_KERN = 64
+SM_SMUSH = 128
+
+
+def layout_smush_mode(smush_mode: int, hlayout: str) -> int:
+    """A font's smush mode with its horizontal layout overridden (--hlayout)."""
+    hlayout = LAYOUT_CHOICES.get(hlayout, hlayout)
+    if hlayout == "default":
+        return smush_mode
+    if hlayout == "full":
+        return 0
+    if hlayout == "fitted":
+        return SM_KERN
+    if hlayout == "controlled smushing":
+        return (smush_mode & 63) | SM_SMUSH
+    if hlayout == "universal smushing":
+        return SM_SMUSH
+    raise ValueError(f'unknown layout "{hlayout}" (use default/full/fitted/0-4)')
+
+
+class CachedFiglet(pyfiglet.Figlet):
+    """Figlet that takes its font from load_font() instead of re-parsing it."""
+
+    def __init__(self, font: str = pyfiglet.DEFAULT_FONT, width: int = 80, hlayout: str = "default", **kwargs):
+        self.hlayout = hlayout
+        super().__init__(font=font, width=width, **kwargs)
+
+    def setFont(self, **kwargs: str) -> None:
+        if "font" in kwargs:
+            self.font = kwargs["font"]
+        font = load_font(self.font)
+        smush_mode = layout_smush_mode(font.smushMode, self.hlayout)
+        if smush_mode != font.smushMode:
+            font = copy.copy(font)  # load_font() results are shared
+            font.smushMode = smush_mode
+        self.Font = font
+
+
+def layout(fig: pyfiglet.Figlet, text: str, stop=None) -> pyfiglet.FigletBuilder:
+    """Run pyfiglet's layout for `text`, as Figlet.renderText() does.
+
+    pyfiglet never terminates when a glyph fits the width but cannot start a
+    line (its wrap retries the same character forever), so the loop has a step
+    budget and raises CharNotPrinted instead. `stop(builder)` is called after
+    each step and can end the layout early by returning True.
+    """
+    builder = pyfiglet.FigletBuilder(text, fig.Font, fig.direction, fig.width, fig.justify)
+    budget = 4 * (len(text) + 1) ** 2
+    while builder.isNotFinished():
+        builder.addCharToProduct()
+        builder.goToNextChar()
+        if stop is not None and stop(builder):
+            break
+        budget -= 1
+        if budget < 0:
+            raise pyfiglet.CharNotPrinted(f"Width {fig.width} is not enough to lay out this text")
+    return builder
+
+
+def figlet_format(text: str, font: str, width: int = 80, hlayout: str = "default") -> str:
+    with STATS.stage("layout"):
+        return layout(CachedFiglet(font=font, width=width, hlayout=hlayout), text).returnProduct()
 
 
 # ============================================================
@@ -356,18 +952,331 @@ def parse_color_spec(spec: str):
 
 def normalize_font(name: str) -> str:
     """Try the name as-is first, then with spaces→underscores."""
-    fonts = pyfiglet.FigletFont.getFonts()
-    if name in fonts:
-        return name
-    alt = name.replace(" ", "_").lower()
-    if alt in fonts:
-        return alt
-    # Fuzzy fallback — try case-insensitive
-    lower = name.lower().replace(" ", "_")
-    for f in fonts:
-        if f.lower() == lower:
-            return f
-    return name  # let pyfiglet raise
+    with STATS.stage("normalize"):
+        return font_index().lookup(name) or name  # unknown: let pyfiglet raise
+
+
+def font_key(name: str) -> str:
+    """Name with case and separators dropped: "ANSI Shadow", "ansi_shadow" and "ansi-shadow" match."""
+    return re.sub(r"[\s_-]+", "", name.lower())
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance (insertions, deletions and substitutions)."""
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[-1]
+
+
+class FontIndex:
+    """Font names hashed by their variants, plus a trigram index for typo suggestions."""
+
+    def __init__(self, names: list[str]):
+        self.names = names
+        self.exact = set(names)
+
+    # Built on first use: most runs name a font exactly and never need them
+
+    @functools.cached_property
+    def keys(self) -> dict[str, str]:
+        keys: dict[str, str] = {}
+        for name in self.names:
+            # Several names can share a key ("bubble", "bubble__"); the first in sorted order wins
+            keys.setdefault(name.lower(), name)
+            keys.setdefault(font_key(name), name)
+        return keys
+
+    @functools.cached_property
+    def postings(self) -> dict[str, list[int]]:
+        postings: dict[str, list[int]] = {}
+        for i, name in enumerate(self.names):
+            for gram in _trigrams(font_key(name)):
+                postings.setdefault(gram, []).append(i)
+        return postings
+
+    def lookup(self, name: str) -> str | None:
+        """The font `name` refers to, ignoring case, spaces, underscores and hyphens; None if unknown."""
+        if name in self.exact:
+            return name
+        alt = name.replace(" ", "_").lower()
+        if alt in self.exact:
+            return alt
+        return self.keys.get(alt) or self.keys.get(font_key(name))
+
+    def suggest(self, name: str, limit: int = 8) -> list[str]:
+        """Fonts whose name contains `name`, then the closest by edit distance, best first."""
+        key = font_key(name)
+        if not key:
+            return []
+        shared: dict[int, int] = {}
+        for gram in _trigrams(key):
+            for i in self.postings.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        # A name containing the key shares all of its inner trigrams; too short to have any, scan
+        inner = len(key) - 2
+        if inner > 0:
+            contains = [i for i, n in shared.items() if n >= inner and key in font_key(self.names[i])]
+        else:
+            contains = [i for i, n in enumerate(self.names) if key in font_key(n)]
+        # Only names sharing a trigram can be within the distance limit (at least for keys of 3+ characters)
+        most = max(2, len(key) // 3)
+        close = sorted(
+            (d, i)
+            for i in shared
+            if i not in contains and (d := edit_distance(key, font_key(self.names[i]))) <= most
+        )
+        found = sorted(contains, key=lambda i: (len(self.names[i]), self.names[i])) + [i for _, i in close]
+        return [self.names[i] for i in found[:limit]]
+
+
+@functools.lru_cache(maxsize=None)
+def font_index() -> FontIndex:
+    return FontIndex(list_fonts())
+
+
+def font_not_found(name: str) -> str:
+    """Error message for an unknown font, with suggestions."""
+    similar = font_index().suggest(name)
+    hint = f"; did you mean {', '.join(similar)}?" if similar else ""
+    return f'font "{name}" not found{hint}'
+
+
+# ============================================================
+# Font catalog — height, width, characters and layout of every font
+# ============================================================
+
+FONT_CATALOG_VERSION = 1
+
+
+def _char_ranges(codes: Sequence[int]) -> list[tuple[int, int]]:
+    """Sorted codepoints as inclusive (first, last) runs."""
+    ranges: list[tuple[int, int]] = []
+    for code in sorted(codes):
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], code)
+        else:
+            ranges.append((code, code))
+    return ranges
+
+
+def font_layout(smush_mode: int) -> str:
+    """Short description of a font's own horizontal layout: full, fitted or smush."""
+    if smush_mode & SM_SMUSH:
+        return "smush"
+    return "fitted" if smush_mode & SM_KERN else "full"
+
+
+def font_info(font: pyfiglet.FigletFont) -> dict:
+    """Catalog entry for a parsed font."""
+    # Undefined characters come out as empty glyphs rather than errors
+    defined = [code for code, rows in font.chars.items() if code == 32 or any(r.strip() for r in rows)]
+    printable = [font.width[code] for code in range(33, 127) if code in font.width]
+    return {
+        "height": font.height,
+        "width": sum(printable) / len(printable) if printable else 0.0,
+        "chars": _char_ranges(defined),
+        "layout": font_layout(font.smushMode),
+        "direction": "right-to-left" if font.printDirection else "left-to-right",
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def font_catalog() -> dict[str, dict]:
+    """Font name -> font_info(), for every font that loads. Rebuilt only when a font directory changes."""
+    stamp = _stamp(_font_dirs())
+    key = (FONT_CATALOG_VERSION, stamp)
+    catalog = _cache_load("catalog", key) if stamp else None
+    if catalog is None:
+        catalog = {}
+        with STATS.stage("catalog"):
+            for name in list_fonts():
+                try:
+                    catalog[name] = font_info(load_font(name))
+                except Exception:
+                    continue  # broken font files are reported by -t, not here
+        if stamp:
+            _cache_store("catalog", key, catalog)
+    return catalog
+
+
+def font_supports(info: dict, text: str) -> bool:
+    """Whether the font has a glyph for every character of `text` (newlines aside)."""
+    ranges = info["chars"]
+    for ch in set(text) - {"\n"}:
+        i = bisect.bisect_right(ranges, (ord(ch), sys.maxunicode)) - 1
+        if i < 0 or ranges[i][1] < ord(ch):
+            return False
+    return True
+
+
+def find_fonts(max_height: int | None = None, supports: str = "") -> list[tuple[str, dict]]:
+    """Catalog entries matching the -l filters, by name."""
+    return [
+        (name, info)
+        for name, info in font_catalog().items()
+        if (max_height is None or info["height"] <= max_height) and font_supports(info, supports)
+    ]
+
+
+# ============================================================
+# --fit: pick a font or line breaks from predicted widths
+# ============================================================
+
+FIT_MODES = ("font", "wrap")
+
+
+@functools.lru_cache(maxsize=4096)
+def glyph_edges(name: str, code: int) -> tuple | None:
+    """Per row of a glyph: (length, leading spaces, trailing spaces, first and last non-space).
+
+    That is all pyfiglet's smushAmount() looks at. Only ASCII spaces count as
+    blank, as in pyfiglet; a blank row has no first/last character.
+    """
+    font = load_font(name)
+    if code not in font.chars:
+        return None
+    rows = []
+    for row in font.chars[code]:
+        body = row.strip(" ")
+        lead = len(row) - len(row.lstrip(" "))
+        rows.append((len(row), lead, len(row) - len(row.rstrip(" ")), body[:1], body[-1:]))
+    return font.width[code], tuple(rows)
+
+
+class LinePredictor:
+    """pyfiglet's layout of a single line, tracking only each row's length and right edge.
+
+    Characters are added one at a time, so the width of every prefix costs one
+    step each. Widths match a real render exactly for every layout: the overlap
+    of each glyph follows FigletBuilder.smushAmount(), and the edge character
+    comparisons go through the builder's own smushChars().
+    """
+
+    def __init__(self, fig: pyfiglet.Figlet):
+        self.font = fig.font
+        self.builder = pyfiglet.FigletBuilder("", fig.Font, fig.direction, fig.width, fig.justify)
+        self.kerns = bool(fig.Font.smushMode & (SM_SMUSH | SM_KERN))
+        height = fig.Font.height
+        self.lengths = [0] * height
+        self.trails = [0] * height  # trailing spaces; the whole row while it is blank
+        self.edges = [""] * height  # last non-space character
+        self.prev_width = 0
+        self.width = 0  # widest row
+        self.need = 0  # smallest layout width at which the line doesn't wrap
+
+    def add(self, text: str) -> int:
+        """Append `text` (no newlines) and return the width of the line so far."""
+        builder = self.builder
+        for ch in text:
+            glyph = glyph_edges(self.font, ord(ch))
+            if glyph is None:
+                continue  # pyfiglet skips characters the font lacks
+            cur_width, rows = glyph
+            builder.prevCharWidth, builder.curCharWidth = self.prev_width, cur_width
+            smush = 0
+            if self.kerns:
+                smush = cur_width
+                for (_, lead, _, first, _), trail, edge in zip(rows, self.trails, self.edges):
+                    amount = lead + trail
+                    if edge and first and builder.smushChars(left=edge, right=first) is not None:
+                        amount += 1
+                    smush = min(smush, amount)
+            self.need = max(self.need, cur_width, self.lengths[0] + cur_width - smush + 1)
+            for r, (length, lead, trail, first, last) in enumerate(rows):
+                old, old_trail, edge = self.lengths[r], self.trails[r], self.edges[r]
+                new = old + max(0, length - smush)
+                if last:
+                    end = old - smush + length - 1 - trail  # position of the glyph's last non-space
+                    if lead == length - 1 - trail and edge and smush == lead + old_trail + 1:
+                        last = builder.smushChars(left=edge, right=first)  # single character, merged
+                    self.trails[r], self.edges[r] = new - 1 - end, last
+                else:
+                    self.trails[r] = old_trail + new - old
+                self.lengths[r] = new
+            self.prev_width = cur_width
+            self.width = max(self.width, max(self.lengths))
+        return self.width
+
+
+def predictable(fig: pyfiglet.Figlet) -> bool:
+    return fig.direction == "left-to-right"
+
+
+def predict_width(text: str, font: str, hlayout: str = "default") -> tuple[int, int]:
+    """(rendered width, smallest --width that keeps it on one line) of a single-line banner."""
+    predictor = LinePredictor(CachedFiglet(font=font, hlayout=hlayout))
+    predictor.add(text)
+    return predictor.width, predictor.need
+
+
+def fit_font(text: str, width: int, hlayout: str = "default", max_height: int | None = None) -> str:
+    """The tallest font that shows `text` on one line within `width`, widest first among equals.
+
+    Candidates come from the catalog, so fonts missing a character of the text
+    are never loaded, and they are tried tallest first, so the search stops at
+    the first height where something fits.
+    """
+    by_height: dict[int, list[str]] = {}
+    for name, info in find_fonts(max_height, text.replace(" ", "")):
+        if info["direction"] == "left-to-right":
+            by_height.setdefault(info["height"], []).append(name)
+    for height in sorted(by_height, reverse=True):
+        fits = []
+        for name in by_height[height]:
+            rendered, need = predict_width(text, name, hlayout)
+            if need <= width:
+                fits.append((-rendered, name))
+        if fits:
+            return min(fits)[1]
+    raise ValueError(f"no font shows this text on one line within {width} columns")
+
+
+def fit_lines(text: str, font: str, width: int, hlayout: str = "default") -> str:
+    """`text` with some spaces turned into newlines so no line wraps at `width`.
+
+    Uses the fewest lines, then the most even ones: least total squared
+    slack, counting the last line too, since a short last line in a banner
+    looks like a mistake. Text that already fits, or that has a word too wide
+    for any line, is returned unchanged for pyfiglet to lay out.
+    """
+    fig = CachedFiglet(font=font, width=width, hlayout=hlayout)
+    if not predictable(fig) or "\n" in text:
+        return text
+    predictor = LinePredictor(fig)
+    predictor.add(text)
+    if predictor.need <= width:
+        return text
+    words = text.split()
+    n = len(words)
+    # best[i] = (lines, raggedness, end of first line) for words[i:]
+    best: list[tuple[int, int, int] | None] = [None] * n + [(0, 0, n)]
+    for i in range(n - 1, -1, -1):
+        predictor = LinePredictor(fig)
+        for j in range(i, n):
+            predictor.add(words[j] if j == i else " " + words[j])
+            if predictor.need > width:
+                break
+            rest = best[j + 1]
+            if rest is not None:
+                option = (rest[0] + 1, rest[1] + (width - predictor.width) ** 2, j + 1)
+                best[i] = min(best[i] or option, option)
+    if best[0] is None:
+        return text  # a word is wider than `width` by itself
+    lines = []
+    i = 0
+    while i < n:
+        end = best[i][2]
+        lines.append(" ".join(words[i:end]))
+        i = end
+    return "\n".join(lines)
 
 
 # ============================================================
@@ -381,12 +1290,9 @@ def show_colors():
         print(f"  {code}{name}{RESET}")
 
     print(f"\n\x1b[1m--- Gradient presets (24-bit true color) ---\x1b[0m\n")
-    sample = pyfiglet.figlet_format("Abc", font="standard").rstrip("\n")
+    sample = figlet_format("Abc", font="standard").rstrip("\n")
     for name, preset in PRESETS.items():
-        swatch = "".join(
-            f"{fg(*multi_stop_lerp(preset['colors'], i / 39))}\u2588{RESET}"
-            for i in range(40)
-        )
+        swatch = encode_line("\u2588" * 40, compile_gradient(tuple(preset["colors"]), "h", 1, 40)[0])
         print(f"  \x1b[1m{name}\x1b[0m  {swatch}")
         colored = apply_gradient(sample, preset["colors"], preset["dir"])
         for line in colored.split("\n"):
@@ -409,6 +1315,487 @@ def show_colors():
     print()
 
 
+# ============================================================
+# --test-all font sweep
+# ============================================================
+
+FILTER_RE = re.compile(r"^\s*([wh])\s*(<=|>=|<|>|=)\s*(\d+)\s*$")
+FILTER_OPS = {
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "=": lambda a, b: a == b,
+}
+
+
+def parse_filters(spec: str) -> list[tuple[str, str, int]]:
+    """Parse "w<=80,h<=8" into [("w", "<=", 80), ("h", "<=", 8)]."""
+    filters = []
+    for part in spec.split(","):
+        m = FILTER_RE.match(part)
+        if not m:
+            raise ValueError(f'bad filter "{part.strip()}" (expected e.g. "w<=80" or "h>=6")')
+        filters.append((m.group(1), m.group(2), int(m.group(3))))
+    return filters
+
+
+def render_filtered(
+    text: str, font: str, width: int, filters: list[tuple[str, str, int]], hlayout: str = "default"
+) -> str | None:
+    """figlet_format() for the sweep, or None if the banner fails `filters`.
+
+    An upper width bound is checked during layout: pyfiglet wraps once a line
+    reaches its width, so the text fits iff a layout at that width never wraps,
+    and the layout stops at the first wrap instead of rendering the whole font.
+    """
+    limit = min((v + (op == "<=") for dim, op, v in filters if dim == "w" and op in ("<", "<=")), default=None)
+    fig = CachedFiglet(font=font, width=width, hlayout=hlayout)
+    if limit is not None and limit <= width:
+        fig.width = limit
+        try:
+            builder = layout(fig, text, stop=lambda b: bool(b.product.queue))
+        except pyfiglet.CharNotPrinted:
+            return None
+        if builder.product.queue:
+            return None  # had to wrap
+        # Justification pads to the layout width, so only left-justified output can be reused
+        if fig.justify == "left":
+            rendered = builder.returnProduct().rstrip("\n")
+        else:
+            fig.width = width
+            rendered = layout(fig, text).returnProduct().rstrip("\n")
+    else:
+        rendered = layout(fig, text).returnProduct().rstrip("\n")
+
+    lines = rendered.split("\n")
+    size = {"w": max((len(line) for line in lines), default=0), "h": len(lines)}
+    if all(FILTER_OPS[op](size[dim], v) for dim, op, v in filters):
+        return rendered
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def cached_colorizer(spec: str, quantize: int, depth: int = 24, dither: str = "none"):
+    """parse_color_spec() memoized for long-lived workers."""
+    return parse_color_spec(spec, quantize, depth, dither)
+
+
+def sweep_font(
+    font: str,
+    text: str,
+    width: int,
+    color: str,
+    quantize: int,
+    filters: list[tuple[str, str, int]],
+    hlayout: str = "default",
+    depth: int = 24,
+    dither: str = "none",
+) -> tuple[str, str | None, str | None]:
+    """Render `text` in one font: (font, output or None if filtered out, error)."""
+    try:
+        rendered = render_filtered(text, font, width, filters, hlayout)
+        if rendered is None:
+            return font, None, None
+        colorize = cached_colorizer(color, quantize, depth, dither)
+        return font, colorize_banner(rendered, text, colorize, font, width, quantize, hlayout, depth, dither), None
+    except Exception as e:
+        return font, None, f"{type(e).__name__}: {e}"
+
+
+def test_all_fonts(
+    text: str,
+    width: int,
+    color: str,
+    quantize: int = 1,
+    filters=(),
+    jobs: int = 1,
+    hlayout: str = "default",
+    depth: int = 24,
+    dither: str = "none",
+) -> tuple[list[tuple[str, str]], int]:
+    """Print `text` in every font, sorted by name, as the renders complete.
+
+    Fonts are rendered across `jobs` worker processes. Returns the fonts that
+    failed, as (font, reason), and how many were skipped by `filters`.
+    """
+    fonts = list_fonts()
+    args = (
+        itertools.repeat(a, len(fonts))
+        for a in (text, width, color, quantize, list(filters), hlayout, depth, dither)
+    )
+    failures = []
+    skipped = 0
+
+    with contextlib.ExitStack() as stack:
+        if jobs > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+            results = pool.map(sweep_font, fonts, *args, chunksize=8)
+        else:
+            results = map(sweep_font, fonts, *args)
+        for f, output, error in results:
+            if error is not None:
+                failures.append((f, error))
+            elif output is None:
+                skipped += 1
+            else:
+                print(f"\x1b[1m--- {f} ---\x1b[0m")
+                print(output)
+                print(flush=True)
+    return failures, skipped
+
+
+# ============================================================
+# --batch: many banners per process
+# ============================================================
+
+# Jobs sent to a worker at a time; banners take well under a millisecond
+# once their font is loaded, so one job per task would be mostly overhead
+BATCH_CHUNK = 32
+
+
+def read_batch(lines: Iterator[str], defaults: dict) -> Iterator[tuple[str, dict | None, str | None]]:
+    """(name, job, error) per non-blank line: a JSON object of TEXT_PARAMS plus "name", or plain text.
+
+    Jobs are `defaults` overridden by the line's fields. name is the line's
+    "name" or its text; error is set (and job None) for a line that can't be used.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if not line.lstrip().startswith("{"):
+            yield line, {**defaults, "text": line}, None
+            continue
+        try:
+            fields = json.loads(line)
+            if not isinstance(fields, dict):
+                raise ValueError("not a JSON object")
+            name = str(fields.pop("name", fields.get("text", "")))
+            job = {**defaults, **check_params(fields, TEXT_PARAMS)}
+            if not job.get("text"):
+                raise ValueError('missing "text"')
+        except ValueError as e:
+            yield f"line {number}", None, str(e)
+            continue
+        for key in ("hlayout", "vlayout"):
+            job[key] = LAYOUT_CHOICES.get(job[key], job[key])
+        yield name, job, None
+
+
+def render_batch_chunk(jobs: list[dict]) -> list[tuple[str | None, str | None]]:
+    """Worker entry point for --batch: (banner, error) per job, in order."""
+    results = []
+    for job in jobs:
+        try:
+            results.append((render_text_job(**job), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def batch_path(name: str, out_dir: str, seen: dict[str, int]) -> str:
+    """<out_dir>/<name>.txt with the name made filename-safe, numbered when names collide."""
+    name = re.sub(r"[^\w.-]+", "_", name).strip("._")[:64] or "banner"
+    seen[name] = seen.get(name, 0) + 1
+    if seen[name] > 1:
+        name = f"{name}-{seen[name]}"
+    return os.path.join(out_dir, f"{name}.txt")
+
+
+def run_text_batch(
+    lines: Iterator[str], defaults: dict, jobs: int = 1, out_dir: str | None = None
+) -> tuple[int, list[tuple[str, str]]]:
+    """Render every job in `lines`, in order, as JSONL on stdout or one file each in `out_dir`.
+
+    Fonts and color specs are loaded once per process and reused. With jobs > 1
+    chunks of BATCH_CHUNK banners go to a process pool, at most 2 * jobs chunks
+    in flight. Returns the number of banners written and (name, reason) failures.
+    """
+    failures = []
+    written = 0
+    seen: dict[str, int] = {}
+
+    def emit(chunk: list[tuple[str, dict | None, str | None]], results: list[tuple[str | None, str | None]]) -> None:
+        nonlocal written
+        rendered = iter(results)
+        for name, job, error in chunk:
+            banner, error = next(rendered) if job is not None else (None, error)
+            if error is not None:
+                failures.append((name, error))
+                if out_dir is None:
+                    print(json.dumps({"name": name, "error": error}))
+                continue
+            with STATS.stage("write"):
+                if out_dir is None:
+                    data = json.dumps({"name": name, "banner": banner}) + "\n"
+                    sys.stdout.write(data)
+                else:
+                    data = banner + "\n"
+                    with open(batch_path(name, out_dir, seen), "w", encoding="utf-8") as f:
+                        f.write(data)
+            written += 1
+            if STATS.enabled:
+                STATS.count("bytes", len(data.encode()))
+
+    entries = read_batch(lines, defaults)
+    chunks = iter(lambda: list(itertools.islice(entries, BATCH_CHUNK)), [])
+    if jobs <= 1:
+        for chunk in chunks:
+            emit(chunk, render_batch_chunk([job for _, job, _ in chunk if job is not None]))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            pending = deque()
+            for chunk in chunks:
+                batch = [job for _, job, _ in chunk if job is not None]
+                pending.append((chunk, pool.submit(render_batch_chunk, batch)))
+                if len(pending) >= 2 * jobs:
+                    chunk, future = pending.popleft()
+                    emit(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                emit(chunk, future.result())
+    sys.stdout.flush()
+    return written, failures
+
+
+# ============================================================
+# --serve: long-running render server
+# ============================================================
+
+MAX_BODY = 1 << 20
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error", 501: "Not Implemented"}
+
+# First match wins; anything else is a 500
+ERROR_STATUS = ((NotImplementedError, 501), (FileNotFoundError, 404), (LookupError, 404), (ValueError, 400))
+
+# Parameter name -> type, per route
+TEXT_PARAMS = {"text": str, "font": str, "color": str, "width": int,
+               "hlayout": str, "vlayout": str, "quantize": int, "color_depth": int, "dither": str}
+IMAGE_PARAMS = {"source": str, "mode": str, "width": int, "quantize": int, "resample": str,
+                "color_depth": int, "dither": str}
+
+
+def check_params(params: dict, schema: dict) -> dict:
+    """`params` converted to the types in `schema` (name -> type); ValueError for unknown names or bad values."""
+    unknown = set(params) - set(schema)
+    if unknown:
+        raise ValueError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+    try:
+        return {k: schema[k](v) for k, v in params.items()}
+    except (TypeError, ValueError):
+        raise ValueError("invalid parameter type") from None
+
+
+def render_text_job(
+    text: str,
+    font: str = "ANSI Shadow",
+    color: str = "none",
+    width: int = 80,
+    hlayout: str = "default",
+    vlayout: str = "default",
+    quantize: int = 1,
+    color_depth: int = 24,
+    dither: str = "none",
+) -> str:
+    """Server worker: one banner, as the CLI would print it."""
+    check_color_depth(color_depth, dither)
+    colorize = cached_colorizer(color, quantize, color_depth, dither)
+    if colorize is no_color and color not in ("", "none"):
+        raise ValueError(f'unknown color "{color}"')
+    font = normalize_font(font)
+    try:
+        rendered = figlet_format(text, font=font, width=width, hlayout=hlayout).rstrip("\n")
+        return colorize_banner(rendered, text, colorize, font, width, quantize, hlayout, color_depth, dither)
+    except pyfiglet.FontNotFound:
+        raise LookupError(font_not_found(font)) from None
+    except pyfiglet.CharNotPrinted as e:
+        raise ValueError(str(e)) from None
+
+
+def render_image_job(
+    source: str,
+    mode: str = "half",
+    width: int = 100,
+    quantize: int = 1,
+    resample: str = "quality",
+    color_depth: int = 24,
+    dither: str = "none",
+) -> str:
+    """Server worker: one image through img2ascii (half) or img2ascii_2x (quad, sextant, braille)."""
+    if resample not in ("quality", "fast"):
+        raise ValueError(f'unknown resample "{resample}" (use quality or fast)')
+    check_color_depth(color_depth, dither)
+    try:
+        if mode == "half":
+            import img2ascii
+
+            return img2ascii.image_to_halfblock(
+                source, width=width, quantize=quantize, resample=resample, depth=color_depth, dither=dither
+            )
+        if mode in ("quad", "sextant", "braille"):
+            import img2ascii_2x
+
+            return img2ascii_2x.image_to_quadblock(
+                source, width=width, quantize=quantize, resample=resample, depth=color_depth, dither=dither, mode=mode
+            )
+    except ImportError as e:
+        raise NotImplementedError(f"image rendering needs the image scripts and their dependencies: {e}") from None
+    raise ValueError(f'unknown mode "{mode}" (use half, quad, sextant or braille)')
+
+
+class RouteMetrics:
+    """Request counters and a window of recent latencies for one route."""
+
+    def __init__(self, window: int = 1024):
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float, error: bool = False, cache_hit: bool = False) -> None:
+        self.requests += 1
+        self.errors += error
+        self.cache_hits += cache_hit
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def pct(q: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3) if ordered else 0.0
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "latency_ms": {
+                "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+            },
+        }
+
+
+class RenderServer:
+    """asyncio HTTP front end; rendering runs in a pool of worker processes.
+
+    Workers are long-lived, so the font cache, compiled gradients and color
+    specs stay warm in each of them; finished banners are kept in an LRU here.
+    """
+
+    def __init__(self, jobs: int = 1, cache_size: int = 256):
+        self.pool = ProcessPoolExecutor(max_workers=jobs)
+        self.cache: OrderedDict[tuple, str] = OrderedDict()
+        self.cache_size = cache_size
+        self.routes = {
+            "/text": (TEXT_PARAMS, render_text_job),
+            "/image": (IMAGE_PARAMS, render_image_job),
+        }
+        self.metrics = {route: RouteMetrics() for route in self.routes}
+        self.started = time.monotonic()
+
+    async def serve(self, address: str) -> None:
+        if address.startswith("unix:"):
+            server = await asyncio.start_unix_server(self.handle, path=address[5:])
+        else:
+            host, _, port = address.rpartition(":")
+            server = await asyncio.start_server(self.handle, host or "127.0.0.1", int(port))
+        where = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Serving on {where}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, ctype, body = 413, "application/json", json.dumps({"error": "request too large"})
+                    keep_alive = False
+                else:
+                    payload = await reader.readexactly(length) if length else b""
+                    status, ctype, body = await self.dispatch(method, target, payload)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = body.encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: {ctype}\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass  # malformed request or client went away
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, payload: bytes) -> tuple[int, str, str]:
+        url = urllib.parse.urlsplit(target)
+        if url.path == "/health":
+            return 200, "text/plain; charset=utf-8", "ok\n"
+        if url.path == "/metrics":
+            return 200, "application/json", json.dumps(self.snapshot(), indent=2) + "\n"
+        if url.path not in self.routes:
+            return 404, "application/json", json.dumps({"error": f"no route {url.path}"})
+        if method not in ("GET", "POST"):
+            return 405, "application/json", json.dumps({"error": "use GET or POST"})
+
+        metrics = self.metrics[url.path]
+        start = time.perf_counter()
+        try:
+            params = self.parse_params(url.path, url.query, payload)
+            # Images can change under the same parameters; the image scripts
+            # keep their own cache keyed on the file's content instead
+            key = (url.path, tuple(sorted(params.items()))) if url.path != "/image" else None
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                metrics.record(time.perf_counter() - start, cache_hit=True)
+                return 200, "text/plain; charset=utf-8", self.cache[key]
+            job = functools.partial(self.routes[url.path][1], **params)
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, job) + "\n"
+        except Exception as e:
+            status = next((code for kind, code in ERROR_STATUS if isinstance(e, kind)), 500)
+            metrics.record(time.perf_counter() - start, error=True)
+            return status, "application/json", json.dumps({"error": f"{type(e).__name__}: {e}"})
+
+        if key is not None:
+            self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        metrics.record(time.perf_counter() - start)
+        return 200, "text/plain; charset=utf-8", result
+
+    def parse_params(self, route: str, query: str, payload: bytes) -> dict:
+        """Query string and JSON body parameters, checked against the route's schema."""
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(query).items()}
+        if payload:
+            body = json.loads(payload)
+            if not isinstance(body, dict):
+                raise ValueError("request body must be a JSON object")
+            params.update(body)
+        return check_params(params, self.routes[route][0])
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "result_cache": {"entries": len(self.cache), "max_entries": self.cache_size},
+            "routes": {route: m.snapshot() for route, m in self.metrics.items()},
+        }
+
+
 # ============================================================
 # Main
 # ============================================================
@@ -454,25 +1841,80 @@ Examples:
     p.add_argument("-f", "--font", default="ANSI Shadow", help='Font name (default: "ANSI Shadow")')
     p.add_argument("-c", "--color", default="none", help="Color spec")
     p.add_argument("--hlayout", default="default", help="Horizontal layout (default/full/fitted/0-4)")
-    p.add_argument("--vlayout", default="default", help="Vertical layout (default/full/fitted/0-4)")
+    p.add_argument("--vlayout", default="default",
+                   help="Vertical layout (default/full/fitted/0-4; pyfiglet does no vertical smushing, so this has no effect)")
     p.add_argument("-w", "--width", type=int, default=80, help="Max width (default: 80)")
-    p.add_argument("-l", "--list", action="store_true", dest="list_fonts", help="List all fonts")
+    p.add_argument("-l", "--list", action="store_true", dest="list_fonts",
+                   help="List fonts with their height, average letter width and layout")
+    p.add_argument("--max-height", type=int, metavar="ROWS",
+                   help="With -l or --fit font: only fonts at most ROWS tall")
+    p.add_argument("--supports", metavar="CHARS", default="",
+                   help="With -l: only fonts with a glyph for every character of CHARS")
+    p.add_argument("--fit", choices=FIT_MODES,
+                   help="Fit the banner in --width without wrapping letters: font picks the tallest font "
+                        "that fits on one line, wrap breaks the text between words into even lines")
     p.add_argument("--colors", action="store_true", help="Show all colors with previews")
     p.add_argument("-t", "--test-all", action="store_true", help="Render text in every font")
+    p.add_argument("--filter", metavar="SPEC",
+                   help='With -t: only fonts whose banner matches, e.g. "w<=80" or "w<=120,h<=8"')
+    p.add_argument("-j", "--jobs", type=int,
+                   help="Worker processes for -t, --serve and --batch (default: CPU count; 1 for --batch)")
+    p.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                   help="Render one banner per line of FILE (default: stdin): plain text, or JSON objects "
+                        'with "text", "name" and any of font, color, width, hlayout, vlayout, quantize, '
+                        "color_depth, dither; the other options give the defaults")
+    p.add_argument("-o", "--output-dir", metavar="DIR",
+                   help="With --batch: write DIR/<name>.txt per banner instead of JSON lines on stdout")
+    p.add_argument("--serve", metavar="ADDR",
+                   help='Run a render server on [HOST:]PORT or unix:PATH (see README)')
+    p.add_argument("--cache-size", type=int, default=256,
+                   help="With --serve: number of rendered results kept in memory (default: 256)")
+    p.add_argument("-q", "--quantize", type=int, default=1, metavar="STEP",
+                   help="Snap gradient colors to a grid of STEP per channel so neighbors share escapes (default: 1, exact)")
+    p.add_argument("--color-depth", type=int, choices=COLOR_DEPTHS, default=24,
+                   help="24-bit color (default), or the nearest of the terminal's 256 or 16 colors")
+    p.add_argument("--dither", choices=DITHER_MODES, default="none",
+                   help="With --color-depth 256/16: ordered (Bayer) or fs (Floyd-Steinberg) dithering of gradients")
+    p.add_argument("--stats", action="store_const", const="text",
+                   help="Print time per stage and cells, escapes and bytes written to stderr when done")
+    p.add_argument("--stats-json", dest="stats", action="store_const", const="json", help="Like --stats, as JSON")
+    p.add_argument("--profile", action="store_const", const="-",
+                   help="Run under cProfile and print the slowest functions to stderr")
+    p.add_argument("--profile-out", dest="profile", metavar="FILE",
+                   help="Like --profile, also saving the raw profile to FILE")
 
     args = p.parse_args()
+    with instrumented(args.stats, args.profile):
+        run(p, args)
+
 
+def run(p: argparse.ArgumentParser, args: argparse.Namespace) -> None:
     if args.list_fonts:
-        fonts = sorted(pyfiglet.FigletFont.getFonts())
-        print(f"{len(fonts)} fonts available:\n")
-        for f in fonts:
-            print(f"  {f}")
+        fonts = find_fonts(args.max_height, args.supports)
+        total = len(font_catalog())
+        print(f"{len(fonts)} of {total} fonts match:\n" if len(fonts) < total else f"{total} fonts available:\n")
+        for name, info in fonts:
+            print(f"  {name:<24} {info['height']:>3} rows  {info['width']:>5.1f} cols/letter  {info['layout']}")
         return
 
     if args.colors:
         show_colors()
         return
 
+    if args.serve:
+        server = RenderServer(jobs=args.jobs or os.cpu_count() or 1, cache_size=args.cache_size)
+        try:
+            asyncio.run(server.serve(args.serve))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.pool.shutdown(cancel_futures=True)
+        return
+
+    if args.batch:
+        run_batch_cli(p, args)
+        return
+
     text = " ".join(args.text) if args.text else None
     if not text:
         p.print_help()
@@ -480,34 +1922,56 @@ Examples:
 
     hlayout = LAYOUT_CHOICES.get(args.hlayout, args.hlayout)
     vlayout = LAYOUT_CHOICES.get(args.vlayout, args.vlayout)
+    try:
+        layout_smush_mode(0, hlayout)
+    except ValueError as e:
+        p.error(str(e))
     font = normalize_font(args.font)
-    colorize = parse_color_spec(args.color)
+    colorize = parse_color_spec(args.color, args.quantize, args.color_depth, args.dither)
 
     if args.test_all:
-        for f in sorted(pyfiglet.FigletFont.getFonts()):
-            try:
-                result = pyfiglet.figlet_format(text, font=f, width=args.width).rstrip("\n")
-                print(f"\x1b[1m--- {f} ---\x1b[0m")
-                if isinstance(colorize, dict) and colorize.get("type") == "letter":
-                    print(apply_per_letter(result, text, colorize["specs"], f, args.width))
-                else:
-                    print(colorize(result))
-                print()
-            except Exception:
-                pass
+        try:
+            filters = parse_filters(args.filter) if args.filter else []
+        except ValueError as e:
+            p.error(str(e))
+        # An unknown spec was already reported above; don't have every worker repeat it
+        color = "none" if colorize is no_color else args.color
+        jobs = args.jobs or os.cpu_count() or 1
+        failures, skipped = test_all_fonts(
+            text, args.width, color, args.quantize, filters, jobs, hlayout, args.color_depth, args.dither
+        )
+        if skipped:
+            print(f"{skipped} fonts skipped by --filter", file=sys.stderr)
+        if failures:
+            print(f"{len(failures)} fonts failed:", file=sys.stderr)
+            for f, reason in failures:
+                print(f"  {f}: {reason}", file=sys.stderr)
         return
 
     try:
-        result = pyfiglet.figlet_format(text, font=font, width=args.width).rstrip("\n")
-        if isinstance(colorize, dict) and colorize.get("type") == "letter":
-            print(apply_per_letter(result, text, colorize["specs"], font, args.width))
-        else:
-            print(colorize(result))
+        if args.fit == "font":
+            with STATS.stage("fit"):
+                font = fit_font(text, args.width, hlayout, args.max_height)
+            print(f"Font: {font}", file=sys.stderr)
+        elif args.fit == "wrap":
+            with STATS.stage("fit"):
+                text = fit_lines(text, font, args.width, hlayout)
+        result = figlet_format(text, font=font, width=args.width, hlayout=hlayout).rstrip("\n")
+        banner = colorize_banner(
+            result, text, colorize, font, args.width, args.quantize, hlayout, args.color_depth, args.dither
+        )
+        with STATS.stage("write"):
+            print(banner)
+        if STATS.enabled:
+            STATS.count("cells", len(result) - result.count("\n"))
+            STATS.count("escapes", banner.count("\x1b["))
+            STATS.count("bytes", len(banner.encode()) + 1)
+    except (pyfiglet.CharNotPrinted, ValueError) as e:
+        print(f"Error: {e} (try a larger --width).", file=sys.stderr)
+        sys.exit(1)
     except pyfiglet.FontNotFound:
         print(f'Error: Font "{args.font}" not found.', file=sys.stderr)
-        fonts = pyfiglet.FigletFont.getFonts()
-        lower = args.font.lower().replace(" ", "_")
-        similar = [f for f in fonts if lower in f.lower()]
+        similar = font_index().suggest(args.font)
         if similar:
             print("\nDid you mean one of these?", file=sys.stderr)
             for f in similar:
@@ -515,5 +1979,35 @@ Examples:
         sys.exit(1)
 
 
+
+def run_batch_cli(p: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    defaults = {
+        "font": args.font,
+        "color": args.color,
+        "width": args.width,
+        "hlayout": LAYOUT_CHOICES.get(args.hlayout, args.hlayout),
+        "vlayout": LAYOUT_CHOICES.get(args.vlayout, args.vlayout),
+        "quantize": args.quantize,
+        "color_depth": args.color_depth,
+        "dither": args.dither,
+    }
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    try:
+        source = contextlib.nullcontext(sys.stdin) if args.batch == "-" else open(args.batch, encoding="utf-8")
+    except OSError as e:
+        p.error(str(e))
+    start = time.perf_counter()
+    with source as lines:
+        written, failures = run_text_batch(lines, defaults, args.jobs or 1, args.output_dir)
+    elapsed = time.perf_counter() - start
+    print(f"{written} banners in {elapsed:.2f}s ({written / elapsed:.0f} banners/s)", file=sys.stderr)
+    if failures:
+        print(f"{len(failures)} failed:", file=sys.stderr)
+        for name, reason in failures:
+            print(f"  {name}: {reason}", file=sys.stderr)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,47 @@
+"""Library API for the ascii_art scripts: render banners and images in-process.
+
+    from ascii_art_lib import TextRenderer, QuadBlockRenderer
+
+    banner = TextRenderer(font="slant", color="fire").render("Hello")
+    for line in QuadBlockRenderer(width=80, mode="sextant").iter_lines("photo.jpg"):
+        ...
+
+The scripts stay standalone, so they can still be run straight from a URL;
+this package loads them as modules on first use. Nothing heavy is imported
+up front: pyfiglet is loaded by the first banner, Pillow and numpy by the
+first image.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "RESET": "core",
+    "fg": "core",
+    "bg": "core",
+    "hex_to_rgb": "core",
+    "parse_width": "core",
+    "write_lines": "core",
+    "load_image": "core",
+    "script": "core",
+    "TextRenderer": "text",
+    "ImageRenderer": "image",
+    "HalfBlockRenderer": "image",
+    "QuadBlockRenderer": "image",
+    "configure_cache": "image",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,76 @@
+"""Shared pieces: color escapes, terminal width, output writing, image loading.
+
+Only the standard library is imported here. The helpers are the scripts'
+own, loaded by script() the first time one is called, so there is one
+copy of each to optimize.
+"""
+
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, BinaryIO, Iterable
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# The scripts live next to this package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESET = "\x1b[0m"
+
+# Lines between flushes in write_lines()
+FLUSH_EVERY = 32
+
+
+def script(name: str) -> ModuleType:
+    """One of the scripts (ascii_art, img2ascii, img2ascii_2x) as a module, loaded on first use.
+
+    It is registered under its own name, so process pools and the scripts'
+    own imports of each other find the same module.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    path = os.path.join(ROOT, f"{name}.py")
+    if not os.path.exists(path):
+        raise ImportError(f"no script {name!r} in {ROOT}")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def load_image(source: str | bytes) -> "Image.Image":
+    """Open a path, URL or image bytes as a PIL image, as the image scripts do (imports Pillow)."""
+    return script("img2ascii").load_image(source)
+
+
+def fg(r: int, g: int, b: int) -> str:
+    """24-bit foreground escape (imports pyfiglet, with ascii_art.py)."""
+    return script("ascii_art").fg(r, g, b)
+
+
+def bg(r: int, g: int, b: int) -> str:
+    """24-bit background escape (imports Pillow and numpy, with img2ascii.py)."""
+    return script("img2ascii").bg(r, g, b)
+
+
+def hex_to_rgb(h: str) -> tuple[int, int, int]:
+    """(r, g, b) from "#rrggbb" or "#rgb" (imports pyfiglet, with ascii_art.py)."""
+    return script("ascii_art").hex_to_rgb(h)
+
+
+def parse_width(spec: str) -> int:
+    """Columns from "80" or a percentage of the terminal like "50%" (of 120 without a terminal)."""
+    return script("img2ascii").parse_width(spec)
+
+
+def write_lines(lines: Iterable[str], out: BinaryIO | None = None, flush_every: int = FLUSH_EVERY) -> None:
+    """Write lines to a binary stream (stdout by default) as they arrive, flushing every `flush_every`."""
+    script("img2ascii").write_lines(lines, out, flush_every)
@@ -0,0 +1,82 @@
+"""Images as half-block (img2ascii.py) or quadrant, sextant and braille (img2ascii_2x.py) cells."""
+
+import abc
+from typing import Iterator
+
+from .core import script
+
+
+class ImageRenderer(abc.ABC):
+    """Base for the image renderers: options fixed per renderer, one image per call.
+
+    `source` is a file path or URL, as on the command line. Lines stream out
+    of iter_lines() as they are encoded; render() and render_bytes() return
+    the whole picture without a trailing newline.
+    """
+
+    def __init__(
+        self,
+        width: int = 120,
+        quantize: int = 1,
+        resample: str = "quality",
+        color_depth: int = 24,
+        dither: str = "none",
+    ):
+        self.width = width
+        self.quantize = quantize
+        self.resample = resample
+        self.color_depth = color_depth
+        self.dither = dither
+
+    @abc.abstractmethod
+    def iter_lines(self, source: str) -> Iterator[str]:
+        """The picture's lines, without newlines, as they are encoded."""
+
+    def render(self, source: str) -> str:
+        return "\n".join(self.iter_lines(source))
+
+    def render_bytes(self, source: str) -> bytes:
+        return self.render(source).encode()
+
+
+class HalfBlockRenderer(ImageRenderer):
+    """img2ascii.py: two pixel rows per line, with transparency."""
+
+    def iter_lines(self, source: str) -> Iterator[str]:
+        return script("img2ascii").iter_halfblock(
+            source, self.width, self.quantize, self.resample, self.color_depth, self.dither
+        )
+
+    def render(self, source: str) -> str:
+        return script("img2ascii").image_to_halfblock(
+            source, self.width, self.quantize, self.resample, self.color_depth, self.dither
+        )
+
+
+class QuadBlockRenderer(ImageRenderer):
+    """img2ascii_2x.py: a two-color fit per cell of 1x2 to 2x4 pixels, per `mode`, in RGB or Lab `space`."""
+
+    def __init__(self, width: int = 120, quantize: int = 1, resample: str = "quality", color_depth: int = 24,
+                 dither: str = "none", mode: str = "quad", space: str = "rgb", uniform: float | None = None):
+        super().__init__(width, quantize, resample, color_depth, dither)
+        self.mode = mode
+        self.space = space
+        self.uniform = uniform
+
+    def iter_lines(self, source: str) -> Iterator[str]:
+        return script("img2ascii_2x").iter_quadblock(
+            source, self.width, self.quantize, False, self.resample, self.color_depth, self.dither, self.mode,
+            self.space, self.uniform,
+        )
+
+    def render(self, source: str) -> str:
+        return script("img2ascii_2x").image_to_quadblock(
+            source, self.width, self.quantize, False, self.resample, self.color_depth, self.dither, self.mode,
+            self.space, self.uniform,
+        )
+
+
+def configure_cache(enabled: bool = True, max_mb: float = 64) -> None:
+    """Turn both image scripts' render cache on or off (it's on by default, as on the command line)."""
+    script("img2ascii").configure_cache(enabled, max_mb)
+    script("img2ascii_2x").configure_cache(enabled, max_mb)
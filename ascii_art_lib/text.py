@@ -0,0 +1,57 @@
+"""Figlet banners, colored the way ascii_art.py colors them."""
+
+from typing import Iterator
+
+from .core import script
+
+
+class TextRenderer:
+    """Render text as a banner; options are ascii_art.py's, fixed per renderer.
+
+    Fonts, gradients and colorizers are cached inside ascii_art across
+    calls, so keeping one renderer around is cheap to reuse.
+    """
+
+    def __init__(
+        self,
+        font: str = "ANSI Shadow",
+        color: str = "none",
+        width: int = 80,
+        hlayout: str = "default",
+        vlayout: str = "default",
+        quantize: int = 1,
+        color_depth: int = 24,
+        dither: str = "none",
+    ):
+        self.font = font
+        self.color = color
+        self.width = width
+        self.hlayout = hlayout
+        self.vlayout = vlayout
+        self.quantize = quantize
+        self.color_depth = color_depth
+        self.dither = dither
+
+    def render(self, text: str) -> str:
+        """The banner as one string, lines joined with newlines and no trailing newline.
+
+        Raises LookupError for an unknown font and ValueError for bad options
+        or characters the font can't print.
+        """
+        return script("ascii_art").render_text_job(
+            text,
+            self.font,
+            self.color,
+            self.width,
+            self.hlayout,
+            self.vlayout,
+            self.quantize,
+            self.color_depth,
+            self.dither,
+        )
+
+    def render_bytes(self, text: str) -> bytes:
+        return self.render(text).encode()
+
+    def iter_lines(self, text: str) -> Iterator[str]:
+        return iter(self.render(text).split("\n"))
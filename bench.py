@@ -0,0 +1,279 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["pyfiglet", "Pillow", "numpy"]
+# ///
+"""Benchmarks for ascii_art.py, img2ascii.py and img2ascii_2x.py, with baseline comparison."""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import ascii_art  # noqa: E402
+import img2ascii  # noqa: E402
+import img2ascii_2x  # noqa: E402
+
+TEXTS = {
+    "short": "Hi!",
+    "word": "Benchmark",
+    "line": "The quick brown fox jumps over the lazy dog",
+}
+FONTS = ["standard", "ansi_shadow", "slant"]
+TEXT_WIDTH = 400  # wide enough that no length wraps
+IMAGE_WIDTHS = [80, 200]
+
+# Differences smaller than this are noise, whatever the relative change
+NOISE_FLOOR = {"seconds": 50e-6, "peak_mb": 0.5, "bytes": 0}
+
+
+# ============================================================
+# Inputs
+# ============================================================
+
+
+def synthetic_images(directory: str) -> dict[str, str]:
+    """Deterministic test images covering flat, smooth, noisy and camera-sized input."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:768, 0:1024]
+    smooth = np.stack([x * 255 // 1023, y * 255 // 767, (x + y) * 255 // 1790], axis=-1).astype(np.uint8)
+    flat = np.zeros((768, 1024, 3), np.uint8)
+    flat[:, :512] = (30, 60, 200)
+    flat[200:500, 300:700] = (240, 200, 20)
+    noise = rng.integers(0, 256, (768, 1024, 3), dtype=np.uint8)
+    photo = np.asarray(Image.fromarray(smooth).resize((4000, 3000), Image.BICUBIC)).astype(np.int16)
+    photo = (photo + rng.integers(-20, 20, photo.shape)).clip(0, 255).astype(np.uint8)
+
+    paths = {}
+    for name, pixels, ext in (
+        ("flat", flat, "png"),
+        ("smooth", smooth, "png"),
+        ("noise", noise, "png"),
+        ("photo12mp", photo, "jpg"),
+    ):
+        paths[name] = os.path.join(directory, f"{name}.{ext}")
+        Image.fromarray(pixels).save(paths[name], quality=90)
+    return paths
+
+
+# ============================================================
+# Cases — each returns the output so bytes and cells can be counted
+# ============================================================
+
+
+def text_cases() -> dict[str, tuple[Callable[[], str], int]]:
+    """name -> (function, cells in the uncolored banner)."""
+    cases = {}
+    for font in FONTS:
+        for label, text in TEXTS.items():
+            rendered = ascii_art.figlet_format(text, font=font, width=TEXT_WIDTH).rstrip("\n")
+            cells = sum(len(line) for line in rendered.split("\n"))
+
+            def gradient(rendered: str = rendered) -> str:
+                ascii_art.compile_gradient.cache_clear()
+                return ascii_art.apply_gradient(rendered, ascii_art.PRESETS["rainbow"]["colors"], "h")
+
+            def radial(rendered: str = rendered) -> str:
+                ascii_art.compile_gradient.cache_clear()
+                return ascii_art.apply_gradient(rendered, ascii_art.PRESETS["lava"]["colors"], "r")
+
+            def per_letter(rendered: str = rendered, text: str = text, font: str = font) -> str:
+                return ascii_art.apply_per_letter(rendered, text, "fire,ice,ocean", font, TEXT_WIDTH)
+
+            def banner(text: str = text, font: str = font) -> str:
+                ascii_art.compile_gradient.cache_clear()
+                ascii_art.cached_colorizer.cache_clear()
+                return ascii_art.render_text_job(text, font, "d:fire", TEXT_WIDTH)
+
+            cases[f"text/gradient/{font}/{label}"] = (gradient, cells)
+            cases[f"text/radial/{font}/{label}"] = (radial, cells)
+            cases[f"text/per_letter/{font}/{label}"] = (per_letter, cells)
+            cases[f"text/banner/{font}/{label}"] = (banner, cells)
+    return cases
+
+
+def image_cases(images: dict[str, str]) -> dict[str, tuple[Callable[[], str], int]]:
+    """name -> (function, output cells). The render cache is off, so every run does the full work."""
+    img2ascii.configure_cache(False)
+    img2ascii_2x.configure_cache(False)
+    cases = {}
+    for name, path in images.items():
+        for width in IMAGE_WIDTHS:
+            half = img2ascii.image_to_halfblock(path, width)
+            quad = img2ascii_2x.image_to_quadblock(path, width)
+            cases[f"image/half/{name}/{width}"] = (
+                lambda path=path, width=width: img2ascii.image_to_halfblock(path, width),
+                (half.count("\n") + 1) * width,
+            )
+            cases[f"image/quad/{name}/{width}"] = (
+                lambda path=path, width=width: img2ascii_2x.image_to_quadblock(path, width),
+                (quad.count("\n") + 1) * width,
+            )
+            for mode in ("sextant", "braille"):
+                cases[f"image/{mode}/{name}/{width}"] = (
+                    lambda path=path, width=width, mode=mode: img2ascii_2x.image_to_quadblock(path, width, mode=mode),
+                    (quad.count("\n") + 1) * width,
+                )
+    return cases
+
+
+def cold_start_cases(images: dict[str, str]) -> dict[str, list[str]]:
+    """name -> command line for a fresh interpreter rendering something small."""
+    return {
+        "cold/ascii_art": [os.path.join(HERE, "ascii_art.py"), "-f", "standard", "-c", "fire", "Hi"],
+        "cold/img2ascii": [os.path.join(HERE, "img2ascii.py"), "--no-cache", "-w", "40", images["smooth"]],
+        "cold/img2ascii_2x": [os.path.join(HERE, "img2ascii_2x.py"), "--no-cache", "-w", "40", images["smooth"]],
+    }
+
+
+# ============================================================
+# Measurement
+# ============================================================
+
+
+def measure(fn: Callable[[], str], cells: int, repeat: int) -> dict:
+    """Median and best time over `repeat` runs after a warm-up, plus a traced run for peak memory.
+
+    Peak memory is what tracemalloc sees: Python objects and numpy buffers,
+    but not Pillow's internal image storage.
+    """
+    out = fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    median = statistics.median(times)
+    return {
+        "seconds": median,
+        "best": min(times),
+        "cells": cells,
+        "cells_per_s": cells / median if median else 0.0,
+        "bytes": len(out.encode()),
+        "peak_mb": peak / (1 << 20),
+    }
+
+
+def measure_cold(cmd: list[str], repeat: int, env: dict[str, str]) -> dict:
+    """Wall time of a whole process, run once first so the on-disk caches are warm."""
+    run = [sys.executable, *cmd]
+    out = subprocess.run(run, capture_output=True, check=True, env=env).stdout
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(run, capture_output=True, check=True, env=env)
+        times.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(times), "best": min(times), "bytes": len(out)}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Cases slower, or larger in output or memory, than the baseline by more than `threshold`."""
+    problems = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for key, label in (("seconds", "time"), ("peak_mb", "peak memory"), ("bytes", "output")):
+            if key not in new or key not in old or not old[key]:
+                continue
+            if new[key] > old[key] * (1 + threshold) and new[key] - old[key] > NOISE_FLOOR[key]:
+                problems.append(f"{name}: {label} {old[key]:.4g} -> {new[key]:.4g} (+{new[key] / old[key] - 1:.0%})")
+    return problems
+
+
+def print_table(results: dict, baseline: dict) -> None:
+    print(f"{'case':<40} {'median':>10} {'cells/s':>12} {'bytes':>10} {'peak MB':>8} {'vs base':>8}")
+    for name, r in results.items():
+        old = baseline.get(name, {}).get("seconds")
+        delta = f"{r['seconds'] / old - 1:+.0%}" if old else ""
+        cells_per_s = f"{r['cells_per_s']:,.0f}" if "cells_per_s" in r else ""
+        peak = f"{r['peak_mb']:.1f}" if "peak_mb" in r else ""
+        print(f"{name:<40} {r['seconds'] * 1000:>8.2f}ms {cells_per_s:>12} {r['bytes']:>10} {peak:>8} {delta:>8}")
+
+
+# ============================================================
+# Main
+# ============================================================
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark the text and image renderers.")
+    p.add_argument("fixtures", nargs="*", help="Extra image files to benchmark alongside the synthetic ones")
+    p.add_argument("-o", "--output", metavar="FILE", help="Write results as JSON")
+    p.add_argument("-b", "--baseline", metavar="FILE", help="Compare against results saved with -o")
+    p.add_argument("-t", "--threshold", type=float, default=0.10,
+                   help="Relative slowdown/growth counted as a regression (default: 0.10)")
+    p.add_argument("-r", "--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    p.add_argument("-k", "--filter", metavar="REGEX", help="Only run cases whose name matches")
+    p.add_argument("--no-cold", action="store_true", help="Skip the cold-start (new process) cases")
+    args = p.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    pattern = re.compile(args.filter) if args.filter else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        images = synthetic_images(tmp)
+        for path in args.fixtures:
+            images[os.path.splitext(os.path.basename(path))[0]] = os.path.abspath(path)
+
+        results = {}
+        cases = {**text_cases(), **image_cases(images)}
+        for name, (fn, cells) in cases.items():
+            if pattern is None or pattern.search(name):
+                results[name] = measure(fn, cells, args.repeat)
+                print(f"  {name}", file=sys.stderr)
+        if not args.no_cold:
+            # Own cache directory, so the user's caches neither help nor get filled
+            env = {**os.environ, "XDG_CACHE_HOME": os.path.join(tmp, "cache")}
+            for name, cmd in cold_start_cases(images).items():
+                if pattern is None or pattern.search(name):
+                    results[name] = measure_cold(cmd, max(1, args.repeat // 2), env)
+                    print(f"  {name}", file=sys.stderr)
+
+    print_table(results, baseline)
+    if args.output:
+        meta = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pillow": Image.__version__,
+            "pyfiglet": ascii_art.pyfiglet.__version__,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        problems = compare(results, baseline, args.threshold)
+        if problems:
+            print(f"\n{len(problems)} regressions over {args.threshold:.0%}:", file=sys.stderr)
+            for problem in problems:
+                print(f"  {problem}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["Pillow"]
+# dependencies = ["Pillow", "numpy"]
 # ///
 """Image to colored ASCII using half-block characters for 2x vertical resolution."""
 
 import argparse
+import contextlib
+import cProfile
+import functools
+import hashlib
+import http.client
 import io
+import json
+import math
 import os
+import pickle
+import pstats
 import sys
-import urllib.request
-from PIL import Image
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, TextIO
+
+import numpy as np
+from PIL import Image, ImageFile, ImageSequence
 
 RESET = "\x1b[0m"
 
@@ -23,48 +39,1387 @@ def bg(r: int, g: int, b: int) -> str:
     return f"\x1b[48;2;{r};{g};{b}m"
 
 
-def load_image(source: str) -> Image.Image:
-    if source.startswith(("http://", "https://")):
-        req = urllib.request.Request(source, headers={"User-Agent": "Mozilla/5.0"})
-        data = urllib.request.urlopen(req).read()
-        return Image.open(io.BytesIO(data)).convert("RGBA")
-    return Image.open(source).convert("RGBA")
+# How images are brought down to the target size:
+#   quality — JPEG draft keeps 2x headroom, then one exact LANCZOS pass
+#   fast    — JPEG draft to the target size, box-reduce, then LANCZOS on the last 2x
+RESAMPLE_MODES = ("quality", "fast")
+DRAFT_HEADROOM = {"quality": 2, "fast": 1}
+REDUCING_GAP = {"quality": None, "fast": 2.0}
+
+# Modes that resample correctly as-is and convert to RGBA exactly afterwards;
+# anything else (palette, 1-bit, LA, CMYK...) is converted before resizing
+SHRINK_FIRST_MODES = ("RGB", "RGBA", "L")
+
+
+def is_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+def load_image(source: str | bytes) -> Image.Image:
+    """Open a path, URL or already-fetched image bytes.
+
+    Files and bytes aren't decoded yet and keep their stored mode, so shrink()
+    can still pick a reduced JPEG decode and convert only the small result.
+    URLs are decoded as they download.
+    """
+    with STATS.stage("load"):
+        if isinstance(source, str) and is_url(source):
+            return FETCHER.get(source, parse=True)[1]
+        return Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def draft(img: Image.Image, size: tuple[int, int], resample: str = "quality") -> None:
+    """Let a JPEG decode straight down to near `size`; does nothing for other formats."""
+    width, height = size
+    headroom = DRAFT_HEADROOM[resample]
+    if img.format == "JPEG" and width * headroom < img.width:
+        # DCT-domain downscale by 1/2, 1/4 or 1/8 while decoding
+        img.draft(None, (width * headroom, height * headroom))
+
+
+def shrink(img: Image.Image, size: tuple[int, int], resample: str = "quality") -> Image.Image:
+    """Resize to `size` and convert to RGBA, doing as little full-resolution work as possible."""
+    draft(img, size, resample)
+    with STATS.stage("decode"):
+        img.load()
+    with STATS.stage("resize"):
+        if img.mode not in SHRINK_FIRST_MODES:
+            img = img.convert("RGBA")
+        img = img.resize(size, Image.LANCZOS, reducing_gap=REDUCING_GAP[resample])
+        return img.convert("RGBA")
+
+
+# Sources with more pixels than this (after any JPEG draft) are shrunk a band
+# at a time, so memory follows the band size instead of the image size
+TILED_PIXELS = 1 << 26
+BAND_PIXELS = 1 << 24
+
+# Bytes per pixel of the uncompressed layouts read_rows() can decode in part
+RAW_BYTES = {
+    "L": 1, "P": 1, "LA": 2, "I;16": 2, "I;16B": 2, "RGB": 3, "BGR": 3,
+    "RGBA": 4, "BGRA": 4, "RGBX": 4, "BGRX": 4, "CMYK": 4,
+}
+
+# Pillow 11 expects decoder tiles as named tuples, older versions as plain ones
+TILE = getattr(ImageFile, "_Tile", lambda *tile: tile)
+
+# Source pixels LANCZOS reads on either side of each output pixel, at 1:1
+LANCZOS_REACH = 3
+
+
+def _row_tiles(img: Image.Image, top: int, bottom: int) -> tuple[list[tuple], int, int] | None:
+    """Decoder tiles for rows [top, bottom) of an undecoded image, and the rows they cover.
+
+    A single uncompressed tile (BMP, PPM, plain TIFF) is cut down to exactly
+    those rows; a tiled layout keeps the tiles that overlap them. None for
+    anything that can only be decoded whole (PNG, compressed TIFF...).
+    """
+    tiles = [tuple(tile) for tile in img.tile]
+    if any(name != "raw" for name, *_ in tiles):
+        return None
+    if len(tiles) == 1:
+        _, extents, offset, args = tiles[0]
+        args = (args,) if isinstance(args, str) else tuple(args)
+        rawmode, stride, orientation = args + (0, 1)[len(args) - 1 :]
+        if tuple(extents) != (0, 0, *img.size) or rawmode not in RAW_BYTES:
+            return None
+        stride = stride or img.width * RAW_BYTES[rawmode]
+        # Bottom-up files store the last row first
+        first = top if orientation > 0 else img.height - bottom
+        tile = ("raw", (0, 0, img.width, bottom - top), offset + first * stride, (rawmode, stride, orientation))
+        return [tile], top, bottom
+    tiles = [tile for tile in tiles if tile[1][1] < bottom and tile[1][3] > top]
+    first = min(tile[1][1] for tile in tiles)
+    last = max(tile[1][3] for tile in tiles)
+    tiles = [(name, (x0, y0 - first, x1, y1 - first), offset, args) for name, (x0, y0, x1, y1), offset, args in tiles]
+    return tiles, first, last
+
+
+def needs_bands(img: Image.Image, size: tuple[int, int], resample: str = "quality") -> bool:
+    """Whether `img` is big enough to shrink a band at a time, and stored so it can be.
+
+    Applies the JPEG draft first. Formats that can only be decoded whole gain
+    nothing from bands, so they go through shrink() however big they are.
+    """
+    draft(img, size, resample)
+    if img.width * img.height <= TILED_PIXELS or not getattr(img, "filename", None):
+        return False
+    return _row_tiles(img, 0, 1) is not None
+
+
+def read_rows(img: Image.Image, top: int, bottom: int) -> Image.Image:
+    """Rows [top, bottom) of `img`, decoding only those where the file allows.
+
+    Files in a layout _row_tiles() understands are reopened with just the
+    needed tiles; anything else is decoded whole, once, and cropped.
+    """
+    path = getattr(img, "filename", None)
+    found = _row_tiles(img, top, bottom) if path and img.tile else None
+    if found is not None:
+        tiles, first, last = found
+        try:
+            part = Image.open(path)
+            # Decoding fills an image of this size; TIFF keeps its own copy of it
+            part._size = (img.width, last - first)
+            if hasattr(part, "_tile_size"):
+                part._tile_size = part._size
+            part.tile = [TILE(*tile) for tile in tiles]
+            part.load()
+        except (OSError, ValueError, SyntaxError):
+            pass  # not what the header suggested after all: decode it whole
+        else:
+            if (first, last) == (top, bottom):
+                return part
+            return part.crop((0, top - first, img.width, bottom - first))
+    img.load()
+    return img.crop((0, top, img.width, bottom))
+
 
+def shrink_bands(
+    img: Image.Image, size: tuple[int, int], resample: str = "quality", band_pixels: int = BAND_PIXELS
+) -> Iterator[Image.Image]:
+    """shrink() for huge sources: yield the result an even number of rows at a time.
 
-def image_to_halfblock(source: str, width: int = 120) -> str:
-    img = load_image(source)
+    Each band covers about `band_pixels` source pixels and is resampled from
+    just those rows plus the filter's reach on either side, at the same
+    sample positions as a whole-image resize, so bands join without seams.
+    """
+    width, height = size
+    draft(img, size, resample)
+    scale = img.height / height
+    rows = max(2, int(band_pixels / img.width / scale) // 2 * 2)
+    reach = math.ceil(LANCZOS_REACH * max(scale, 1.0)) + 1
+    # --resample fast box-reduces first; do it here, in blocks lined up with
+    # the ones Image.resize() would use on the whole image
+    gap = REDUCING_GAP[resample]
+    block = (int(img.width / width / gap) or 1, int(scale / gap) or 1) if gap else (1, 1)
+    for y0 in range(0, height, rows):
+        y1 = min(y0 + rows, height)
+        top = max(0, int(y0 * scale) - reach)
+        top -= top % block[1]
+        bottom = min(img.height, math.ceil(y1 * scale) + reach)
+        bottom = min(img.height, bottom + -bottom % block[1])
+        with STATS.stage("decode"):
+            part = read_rows(img, top, bottom)
+        with STATS.stage("resize"):
+            if part.mode not in SHRINK_FIRST_MODES:
+                part = part.convert("RGBA")
+            box = (0, y0 * scale - top, img.width, y1 * scale - top)
+            # Image.resize() doesn't reduce RGBA images
+            if block != (1, 1) and part.mode != "RGBA":
+                part = part.reduce(block)
+                box = (0, box[1] / block[1], img.width / block[0], box[3] / block[1])
+            part = part.resize((width, y1 - y0), Image.LANCZOS, box=box)
+            part = part.convert("RGBA")
+        yield part
 
-    # Resize: height must be even (we consume 2 rows per character row)
+
+def halfblock_size(img: Image.Image, width: int) -> tuple[int, int]:
+    # Height must be even (we consume 2 rows per character row)
     aspect = img.height / img.width
     height = int(width * aspect)
     if height % 2 != 0:
         height += 1
+    return width, height
 
-    img = img.resize((width, height), Image.LANCZOS)
 
-    lines = []
-    for y in range(0, height, 2):
-        chars = []
-        for x in range(width):
-            # Top pixel = foreground (▀), bottom pixel = background
-            r1, g1, b1, a1 = img.getpixel((x, y))
-            if y + 1 < height:
-                r2, g2, b2, a2 = img.getpixel((x, y + 1))
-            else:
-                r2, g2, b2, a2 = 0, 0, 0, 0
-            top = a1 > 30
-            bot = a2 > 30
-            if not top and not bot:
-                chars.append(" ")
-            elif top and bot:
-                chars.append(f"{fg(r1, g1, b1)}{bg(r2, g2, b2)}\u2580{RESET}")
-            elif top:
-                chars.append(f"{fg(r1, g1, b1)}\u2580{RESET}")
+def resize_for_halfblock(img: Image.Image, width: int, resample: str = "quality") -> Image.Image:
+    return shrink(img, halfblock_size(img, width), resample)
+
+
+# ============================================================
+# Instrumentation — per-stage timers and counters for --stats / --profile
+# ============================================================
+
+# Functions shown in the --profile report
+PROFILE_LINES = 25
+
+
+class Stats:
+    """Wall time per named stage, plus counters such as cells and bytes.
+
+    Stages nest, and time spent in an inner stage isn't counted in the outer
+    one, so stage times add up to at most the wall time. While disabled (the
+    default) stage() returns a shared no-op and count() returns immediately.
+    Only the main thread records stages.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.times: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self._stack: list[list] = []  # [name, start of its not yet counted time]
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager:
+        return self._timed(name) if self.enabled else _NO_STAGE
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1])
+        entry = [name, now]
+        self._stack.append(entry)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._stack.pop()
+            self._add(name, now - entry[1])
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def _add(self, name: str, seconds: float) -> None:
+        self.times[name] = self.times.get(name, 0.0) + seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "stages": {name: {"seconds": t, "calls": self.calls.get(name, 0)} for name, t in self.times.items()},
+            "counters": dict(self.counters),
+        }
+
+    def merge(self, snapshot: dict) -> None:
+        """Fold in a snapshot taken elsewhere (e.g. by a batch worker)."""
+        for name, stage in snapshot["stages"].items():
+            self._add(name, stage["seconds"])
+            self.calls[name] = self.calls.get(name, 0) + stage["calls"]
+        for name, n in snapshot["counters"].items():
+            self.count(name, n)
+
+    def report(self, fmt: str, wall: float, out: TextIO | None = None) -> None:
+        """Print the stages (slowest first, then untimed "other") and counters as text or JSON."""
+        out = out or sys.stderr
+        if fmt == "json":
+            print(json.dumps({**self.snapshot(), "wall_seconds": wall}, indent=2), file=out)
+            return
+        other = max(0.0, wall - sum(self.times.values()))
+        rows = sorted(self.times.items(), key=lambda item: -item[1]) + [("other", other)]
+        print(f"{'stage':<10} {'time':>10} {'share':>6} {'calls':>7}", file=out)
+        for name, seconds in rows:
+            share = seconds / wall if wall else 0.0
+            print(f"{name:<10} {seconds * 1000:>8.1f}ms {share:>6.1%} {self.calls.get(name, ''):>7}", file=out)
+        print(f"{'total':<10} {wall * 1000:>8.1f}ms", file=out)
+        for name, n in self.counters.items():
+            print(f"{name:<10} {n:>10,}", file=out)
+
+
+STATS = Stats()
+_NO_STAGE = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def instrumented(stats: str | None = None, profile: str | None = None) -> Iterator[None]:
+    """Run the body with STATS enabled and/or under cProfile, reporting both to stderr at the end.
+
+    stats is "text" or "json". profile is "-" for the report alone, or a path
+    that also gets the raw profile (for pstats or snakeviz).
+    """
+    STATS.enabled = stats is not None
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+            if profile != "-":
+                profiler.dump_stats(profile)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        if stats:
+            STATS.report(stats, wall)
+
+
+# ============================================================
+# Palette output — 256 and 16 colors for terminals without true color
+# ============================================================
+
+COLOR_DEPTHS = (24, 256, 16)
+DITHER_MODES = ("none", "ordered", "fs")
+
+# xterm's color table: the 16 system colors at their xterm defaults, the
+# 6x6x6 cube and the gray ramp. 256-color output only picks from 16-255, since
+# terminals let users redefine the first 16.
+_LEVELS = np.array([0, 95, 135, 175, 215, 255])
+XTERM_COLORS = np.concatenate([
+    np.array([
+        (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+        (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+    ]),
+    np.stack(np.meshgrid(_LEVELS, _LEVELS, _LEVELS, indexing="ij"), axis=-1).reshape(-1, 3),
+    np.repeat(np.arange(8, 248, 10)[:, None], 3, axis=1),
+])
+PALETTE_RANGE = {256: (16, 256), 16: (0, 16)}
+
+# Per-channel weights for color distance, a cheap stand-in for perceived difference
+_DISTANCE_WEIGHTS = np.array([2, 4, 3])
+
+# Ordered dithering: 8x8 Bayer thresholds in [-0.5, 0.5), scaled by roughly
+# one palette step
+BAYER_8 = (np.array([
+    [0, 32, 8, 40, 2, 34, 10, 42], [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44, 4, 36, 14, 46, 6, 38], [60, 28, 52, 20, 62, 30, 54, 22],
+    [3, 35, 11, 43, 1, 33, 9, 41], [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47, 7, 39, 13, 45, 5, 37], [63, 31, 55, 23, 61, 29, 53, 21],
+]) + 0.5) / 64 - 0.5
+DITHER_SPREAD = {256: 40, 16: 128}
+
+
+@functools.lru_cache(maxsize=None)
+def palette_cube(depth: int) -> np.ndarray:
+    """32x32x32 table of the nearest xterm color number for each 8x8x8 block of RGB space.
+
+    Built once per depth as one matrix product (about 25ms), so mapping a frame
+    is a single fancy-indexing lookup instead of a palette search per pixel.
+    """
+    lo, hi = PALETTE_RANGE[depth]
+    palette = XTERM_COLORS[lo:hi].astype(np.float32)
+    weights = _DISTANCE_WEIGHTS.astype(np.float32)
+    centers = (np.indices((32, 32, 32)).reshape(3, -1).T * 8 + 4).astype(np.float32)
+    # |c - p|^2 without the |c|^2 term, which is the same for every p
+    dist = (palette**2 * weights).sum(axis=1) - 2 * (centers * weights) @ palette.T
+    return (dist.argmin(axis=1) + lo).astype(np.uint8).reshape(32, 32, 32)
+
+
+def palette_numbers(rgb: np.ndarray, depth: int, dither: str = "none") -> np.ndarray:
+    """xterm color numbers for a (rows, cols, 3) array of colors."""
+    if dither == "fs":
+        return _floyd_steinberg(rgb, depth)
+    if dither == "ordered":
+        rows, cols = rgb.shape[:2]
+        threshold = BAYER_8[np.arange(rows)[:, None] % 8, np.arange(cols) % 8]
+        rgb = np.clip(rgb + threshold[..., None] * DITHER_SPREAD[depth], 0, 255).astype(np.intp)
+    cube = palette_cube(depth)
+    return cube[rgb[..., 0] >> 3, rgb[..., 1] >> 3, rgb[..., 2] >> 3].astype(np.intp)
+
+
+def _floyd_steinberg(rgb: np.ndarray, depth: int) -> np.ndarray:
+    """Error-diffusion mapping. Error moves along a row one pixel at a time, but
+    each row hands its errors down to the next in one vectorized step."""
+    cube = palette_cube(depth).ravel().tolist()
+    colors = XTERM_COLORS.tolist()
+    rows, cols = rgb.shape[:2]
+    out = np.empty((rows, cols), dtype=np.intp)
+    want = rgb.astype(np.float64)
+    for y in range(rows):
+        carry = (0.0, 0.0, 0.0)
+        numbers, errors = [], []
+        for pixel in want[y].tolist():
+            r, g, b = (min(max(c + e, 0.0), 255.0) for c, e in zip(pixel, carry))
+            n = cube[(int(r) >> 3) << 10 | (int(g) >> 3) << 5 | int(b) >> 3]
+            pr, pg, pb = colors[n]
+            errors.append((r - pr, g - pg, b - pb))
+            carry = ((r - pr) * 7 / 16, (g - pg) * 7 / 16, (b - pb) * 7 / 16)
+            numbers.append(n)
+        out[y] = numbers
+        if y + 1 < rows:
+            err = np.array(errors)
+            want[y + 1] += err * 5 / 16
+            want[y + 1, :-1] += err[1:] * 3 / 16  # down-left of the pixel to the right
+            want[y + 1, 1:] += err[:-1] / 16      # down-right of the pixel to the left
+    return out
+
+
+def sgr_params(numbers: np.ndarray, depth: int, background: bool = False) -> np.ndarray:
+    """The last SGR parameter selecting each color: n for 38;5;n, or 30-37/90-97 (+10 for background)."""
+    if depth == 256:
+        return numbers
+    return np.where(numbers < 8, 30, 82) + numbers + (10 if background else 0)
+
+
+# ============================================================
+# Output encoding — emit SGR escapes only when the color changes
+# ============================================================
+
+# Background requirement per cell
+BG_DEFAULT = 0  # terminal default background must show (spaces, lone ▀/▄)
+BG_SET = 1      # cell needs its own background color
+BG_ANY = 2      # background is fully covered by the glyph
+
+# Lines are assembled from a fixed table of string tokens, so each one is a
+# single "".join over an object array instead of one f-string per cell.
+# Tokens 0-255 are "n;", 256-511 are "nm" (the last parameter of an escape).
+# Each escape prefix below is also fused with each of those 512, so a cell's
+# escape starts with one token rather than two: a full 24-bit cell is 7
+# tokens instead of 9.
+_TOK_FG = 512
+_TOK_BG = 513
+_TOK_BG_NEXT = 514  # bg parameters continuing an fg escape: ESC[38;2;r;g;b;48;2;r;g;bm
+_TOK_BG_DEFAULT = 515
+_TOK_BG_DEFAULT_NEXT = 516
+_TOK_RESET = 517
+_TOK_NONE = 518
+_TOK_FG_256 = 519
+_TOK_BG_256 = 520
+_TOK_BG_NEXT_256 = 521
+_TOK_CSI = 522  # 16 colors: ESC[31;42m, the bg continuing with no prefix of its own
+_TOK_FUSED = 523  # prefix token t with parameter token p is _TOK_FUSED + (t - _TOK_FG) * 512 + p
+_TOK_GLYPHS = _TOK_FUSED + (_TOK_FUSED - _TOK_FG) * 512
+
+# (fg, bg, bg continuing an fg escape) prefixes per color depth
+_INTRO_TOKENS = {
+    24: (_TOK_FG, _TOK_BG, _TOK_BG_NEXT),
+    256: (_TOK_FG_256, _TOK_BG_256, _TOK_BG_NEXT_256),
+    16: (_TOK_CSI, _TOK_CSI, _TOK_NONE),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _token_table(glyphs: str) -> np.ndarray:
+    params = [f"{i};" for i in range(256)] + [f"{i}m" for i in range(256)]
+    prefixes = ["\x1b[38;2;", "\x1b[48;2;", "48;2;", "\x1b[49m", "49m", RESET, ""]
+    prefixes += ["\x1b[38;5;", "\x1b[48;5;", "48;5;", "\x1b["]
+    return np.array(
+        params + prefixes + [prefix + param for prefix in prefixes for param in params] + list(glyphs), dtype=object
+    )
+
+
+def _fused(prefix: int | np.ndarray, param: np.ndarray) -> np.ndarray:
+    return _TOK_FUSED + (prefix - _TOK_FG) * 512 + param
+
+
+def quantize_colors(rgb: np.ndarray, step: int) -> np.ndarray:
+    """Snap channels to the center of a grid of `step` so near colors share escapes."""
+    if step <= 1:
+        return rgb
+    return np.minimum(rgb // step * step + step // 2, 255)
+
+
+def _changed(on: np.ndarray, code: np.ndarray) -> np.ndarray:
+    """Cells that are `on` and whose code differs from the state left by earlier cells.
+
+    The state at the start of each row is -1 (terminal default).
+    """
+    rows, cols = on.shape
+    last = np.maximum.accumulate(np.where(on, np.arange(cols), -1), axis=1)
+    prev = np.concatenate([np.full((rows, 1), -1), last[:, :-1]], axis=1)
+    prev_code = np.where(prev >= 0, np.take_along_axis(code, np.maximum(prev, 0), axis=1), -1)
+    return on & (code != prev_code)
+
+
+def encode_cells(
+    glyphs: str,
+    glyph_idx: np.ndarray,
+    fg_rgb: np.ndarray,
+    fg_on: np.ndarray,
+    bg_rgb: np.ndarray,
+    bg_mode: np.ndarray,
+    quantize: int = 1,
+    depth: int = 24,
+    dither: str = "none",
+) -> list[str]:
+    """Encode a grid of cells as lines of text with minimal SGR escapes.
+
+    glyph_idx indexes into `glyphs`; fg_on is False where the foreground is
+    irrelevant (spaces); bg_mode is one of BG_DEFAULT/BG_SET/BG_ANY. Escapes are
+    only emitted when the color in effect has to change, and every line that
+    set a color ends with a single RESET.
+
+    At depth 256 or 16 colors are mapped to the xterm palette, dithered as
+    asked; fg_rgb/bg_rgb may then also be (rows, cols) arrays of color numbers.
+    """
+    rows, cols = glyph_idx.shape
+    if depth == 24:
+        fg_rgb = quantize_colors(fg_rgb.astype(np.intp), quantize)
+        bg_rgb = quantize_colors(bg_rgb.astype(np.intp), quantize)
+        fg_code = (fg_rgb[..., 0] << 16) | (fg_rgb[..., 1] << 8) | fg_rgb[..., 2]
+        bg_code = np.where(bg_mode == BG_SET, (bg_rgb[..., 0] << 16) | (bg_rgb[..., 1] << 8) | bg_rgb[..., 2], -1)
+        fg_params = [fg_rgb[..., 0], fg_rgb[..., 1], fg_rgb[..., 2]]
+        bg_params = [bg_rgb[..., 0], bg_rgb[..., 1], bg_rgb[..., 2]]
+    else:
+        fg_code = fg_rgb if fg_rgb.ndim == 2 else palette_numbers(fg_rgb.astype(np.intp), depth, dither)
+        bg_num = bg_rgb if bg_rgb.ndim == 2 else palette_numbers(bg_rgb.astype(np.intp), depth, dither)
+        bg_code = np.where(bg_mode == BG_SET, bg_num, -1)
+        fg_params = [sgr_params(fg_code, depth)]
+        bg_params = [sgr_params(bg_num, depth, background=True)]
+    tok_fg, tok_bg, tok_bg_next = _INTRO_TOKENS[depth]
+
+    fg_emit = _changed(fg_on, fg_code)
+    bg_emit = _changed(bg_mode != BG_ANY, bg_code)
+    bg_set = bg_emit & (bg_mode == BG_SET)
+    bg_default = bg_emit & (bg_mode == BG_DEFAULT)
+
+    # Parameter tokens: the fg's last ends in ";" when a bg follows in the same escape
+    fg_tokens = [*fg_params[:-1], fg_params[-1] + np.where(bg_emit, 0, 256)]
+    bg_tokens = [*bg_params[:-1], bg_params[-1] + 256]
+    per_cell = len(fg_tokens) + len(bg_tokens) + 1
+
+    # Each line is its cells' tokens, then a RESET slot; unused slots stay empty
+    slots = np.full((rows, cols * per_cell + 1), _TOK_NONE, np.int16)
+    cells = slots[:, :-1].reshape(rows, cols, per_cell)
+    fill = functools.partial(np.copyto, casting="unsafe")
+    fill(cells[..., 0], _fused(tok_fg, fg_tokens[0]), where=fg_emit)
+    for i, token in enumerate(fg_tokens[1:], 1):
+        fill(cells[..., i], token, where=fg_emit)
+    at = len(fg_tokens)
+    fill(cells[..., at], _fused(np.where(fg_emit, tok_bg_next, tok_bg), bg_tokens[0]), where=bg_set)
+    fill(cells[..., at], np.where(fg_emit, _TOK_BG_DEFAULT_NEXT, _TOK_BG_DEFAULT), where=bg_default)
+    for i, token in enumerate(bg_tokens[1:], at + 1):
+        fill(cells[..., i], token, where=bg_set)
+    cells[..., -1] = glyph_idx + _TOK_GLYPHS
+    colored = (fg_emit | bg_emit).any(axis=1)
+    slots[colored, -1] = _TOK_RESET
+    if STATS.enabled:
+        STATS.count("cells", glyph_idx.size)
+        STATS.count("escapes", int(np.count_nonzero(fg_emit | bg_emit) + np.count_nonzero(colored)))
+    return ["".join(row) for row in _token_table(glyphs)[slots].tolist()]
+
+
+# ============================================================
+# Half-block renderer
+# ============================================================
+
+HALF_GLYPHS = " \u2580\u2584"
+
+# Lines rendered per step when streaming
+BAND_ROWS = 32
+
+
+def halfblock_grid(img: Image.Image) -> tuple[np.ndarray, ...]:
+    """encode_cells() inputs for an even-height RGBA image, two pixel rows per cell."""
+    width, height = img.size
+    px = np.asarray(img).reshape(height // 2, 2, width, 4)
+    # Top pixel = foreground (▀), bottom pixel = background
+    top_px, bot_px = px[:, 0], px[:, 1]
+    top = top_px[..., 3] > 30
+    bot = bot_px[..., 3] > 30
+
+    # Lone bottom pixels are drawn as ▄ in the foreground color
+    fg_rgb = np.where(top[..., None], top_px[..., :3], bot_px[..., :3])
+    glyph_idx = np.where(top, 1, np.where(bot, 2, 0))
+    bg_mode = np.where(top & bot, BG_SET, BG_DEFAULT)
+    return glyph_idx, fg_rgb, top | bot, bot_px[..., :3], bg_mode
+
+
+def halfblock_lines(img: Image.Image, quantize: int = 1, depth: int = 24, dither: str = "none") -> list[str]:
+    """Render an even-height RGBA image, two pixel rows per line."""
+    with STATS.stage("cells"):
+        grid = halfblock_grid(img)
+    with STATS.stage("encode"):
+        return encode_cells(HALF_GLYPHS, *grid, quantize=quantize, depth=depth, dither=dither)
+
+
+def iter_halfblock_lines(
+    img: Image.Image, quantize: int = 1, band: int = BAND_ROWS, depth: int = 24, dither: str = "none"
+) -> Iterator[str]:
+    """Yield finished lines, rendering `band` lines at a time."""
+    width, height = img.size
+    for y in range(0, height, band * 2):
+        yield from halfblock_lines(img.crop((0, y, width, min(y + band * 2, height))), quantize, depth, dither)
+
+
+def iter_banded_halfblock_lines(
+    img: Image.Image,
+    size: tuple[int, int],
+    quantize: int = 1,
+    resample: str = "quality",
+    depth: int = 24,
+    dither: str = "none",
+) -> Iterator[str]:
+    """iter_halfblock_lines() for a source too big to decode whole, shrinking it band by band."""
+    for band in shrink_bands(img, size, resample):
+        yield from halfblock_lines(band, quantize, depth, dither)
+
+
+def _render_halfblock(
+    source: str, width: int, quantize: int, resample: str, depth: int = 24, dither: str = "none"
+) -> str | Iterator[str]:
+    """Cached text for `source`, or an iterator of lines that fills the cache as it runs."""
+    cache = RENDER_CACHE
+    if cache is None:
+        img = load_image(source)
+        size = halfblock_size(img, width)
+        if needs_bands(img, size, resample):
+            return iter_banded_halfblock_lines(img, size, quantize, resample, depth, dither)
+        return iter_halfblock_lines(shrink(img, size, resample), quantize, depth=depth, dither=dither)
+
+    ident, data = source_id(source)
+    text_name = cache.key(ident, "half", width, resample, quantize, depth, dither) + ".ans"
+    text = cache.get(text_name)
+    if text is not None:
+        return text
+
+    # Resized pixels don't depend on quantize or depth, so they're shared across settings
+    pixels_name = cache.key(ident, "half", width, resample) + ".npy"
+    pixels = cache.get(pixels_name) if cache.pixels else None
+    if pixels is not None:
+        img = Image.fromarray(pixels, "RGBA")
+    else:
+        img = load_image(source if data is None else data)
+        size = halfblock_size(img, width)
+        if needs_bands(img, size, resample):
+            # Too big to keep the resized pixels around for
+            lines = iter_banded_halfblock_lines(img, size, quantize, resample, depth, dither)
+            return cache.record(text_name, lines)
+        img = shrink(img, size, resample)
+        if cache.pixels:
+            cache.put(pixels_name, np.asarray(img))
+    return cache.record(text_name, iter_halfblock_lines(img, quantize, depth=depth, dither=dither))
+
+
+def iter_halfblock(
+    source: str, width: int = 120, quantize: int = 1, resample: str = "quality", depth: int = 24, dither: str = "none"
+) -> Iterator[str]:
+    lines = _render_halfblock(source, width, quantize, resample, depth, dither)
+    return iter(lines.split("\n") if lines else ()) if isinstance(lines, str) else lines
+
+
+def image_to_halfblock(
+    source: str, width: int = 120, quantize: int = 1, resample: str = "quality", depth: int = 24, dither: str = "none"
+) -> str:
+    lines = _render_halfblock(source, width, quantize, resample, depth, dither)
+    return lines if isinstance(lines, str) else "\n".join(lines)
+
+
+def write_lines(lines: Iterable[str], out: BinaryIO | None = None, flush_every: int = BAND_ROWS) -> None:
+    """Write lines to a binary stream as they arrive, flushing every `flush_every`."""
+    if out is None:
+        sys.stdout.flush()  # keep ordering with anything already print()ed
+        out = sys.stdout.buffer
+    written = 0
+    for i, line in enumerate(lines, 1):
+        with STATS.stage("write"):
+            data = line.encode()
+            out.write(data)
+            out.write(b"\n")
+            written += len(data) + 1
+            if i % flush_every == 0:
+                out.flush()
+    out.flush()
+    STATS.count("bytes", written)
+
+
+# ============================================================
+# Playback — animated images and raw video, redrawing only changed cells
+# ============================================================
+
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+CLEAR_SCREEN = "\x1b[2J"
+
+# Unchanged cells between two changed ones are redrawn instead of jumped over
+# when the gap is at most this wide (a cursor move costs ~8 bytes)
+MAX_GAP = 4
+
+
+def iter_frames(
+    source: str, raw_size: tuple[int, int] | None = None, fps: float = 25
+) -> Iterator[tuple[Image.Image, float]]:
+    """(frame, seconds to show it) for each frame of `source`.
+
+    Animated GIF/APNG/WebP frames come from Pillow with their own durations.
+    With raw_size, `source` is a stream of raw RGB24 frames ("-" for stdin),
+    e.g. from ffmpeg -f rawvideo -pix_fmt rgb24, shown at `fps`.
+    """
+    if raw_size:
+        frame_bytes = raw_size[0] * raw_size[1] * 3
+        with contextlib.ExitStack() as stack:
+            stream = sys.stdin.buffer if source == "-" else stack.enter_context(open(source, "rb"))
+            while len(data := stream.read(frame_bytes)) == frame_bytes:
+                yield Image.frombytes("RGB", raw_size, data), 1 / fps
+        return
+    # Frames are seeked through, which needs the whole file rather than a streamed decode
+    img = Image.open(io.BytesIO(FETCHER.get(source)[0])) if is_url(source) else load_image(source)
+    for frame in ImageSequence.Iterator(img):
+        # Browsers treat a zero delay as 100ms too
+        yield frame, (frame.info.get("duration") or 100) / 1000
+
+
+def quantize_grid(
+    grid: tuple[np.ndarray, ...], quantize: int, depth: int = 24, dither: str = "none"
+) -> tuple[np.ndarray, ...]:
+    """Snap a grid's colors up front so frames are compared as they will be drawn.
+
+    Below 24-bit the colors become palette numbers, dithered over the whole frame.
+    """
+    glyph_idx, fg_rgb, fg_on, bg_rgb, bg_mode = grid
+    if depth == 24:
+        fg_rgb = quantize_colors(fg_rgb.astype(np.intp), quantize)
+        bg_rgb = quantize_colors(bg_rgb.astype(np.intp), quantize)
+    else:
+        fg_rgb = palette_numbers(fg_rgb.astype(np.intp), depth, dither)
+        bg_rgb = palette_numbers(bg_rgb.astype(np.intp), depth, dither)
+    return glyph_idx, fg_rgb, fg_on, bg_rgb, bg_mode
+
+
+def _differs(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Per-cell inequality of (rows, cols, 3) colors or (rows, cols) palette numbers."""
+    diff = a != b
+    return diff.any(axis=-1) if diff.ndim == 3 else diff
+
+
+def encode_grid_diff(
+    glyphs: str,
+    grid: tuple[np.ndarray, ...],
+    prev: tuple[np.ndarray, ...] | None,
+    max_gap: int = MAX_GAP,
+    depth: int = 24,
+) -> str:
+    """Escapes that update a screen showing `prev` (None: blank) to show `grid`.
+
+    Each run of changed cells is a cursor move followed by the run encoded
+    like a line, so it starts and ends in the default colors.
+    """
+    glyph_idx, fg_rgb, fg_on, bg_rgb, bg_mode = grid
+    if prev is None:
+        changed = np.ones(glyph_idx.shape, dtype=bool)
+    else:
+        p_glyph, p_fg, p_on, p_bg, p_mode = prev
+        changed = (
+            (glyph_idx != p_glyph)
+            | (fg_on != p_on)
+            | (bg_mode != p_mode)
+            | (fg_on & _differs(fg_rgb, p_fg))
+            | ((bg_mode == BG_SET) & _differs(bg_rgb, p_bg))
+        )
+    out = []
+    for row in np.flatnonzero(changed.any(axis=1)):
+        cols = np.flatnonzero(changed[row])
+        breaks = np.flatnonzero(np.diff(cols) > max_gap + 1)
+        for start, end in zip(cols[np.r_[0, breaks + 1]], cols[np.r_[breaks, -1]] + 1):
+            run = np.s_[row : row + 1, start:end]
+            out.append(f"\x1b[{row + 1};{start + 1}H")
+            cells = encode_cells(glyphs, glyph_idx[run], fg_rgb[run], fg_on[run], bg_rgb[run], bg_mode[run], depth=depth)
+            out.append(cells[0])
+    return "".join(out)
+
+
+def play_halfblock(
+    source: str,
+    width: int = 120,
+    quantize: int = 1,
+    resample: str = "quality",
+    raw_size: tuple[int, int] | None = None,
+    fps: float = 25,
+    loop: bool = False,
+    depth: int = 24,
+    dither: str = "none",
+    out: BinaryIO | None = None,
+) -> dict:
+    """Play `source` from the top of the screen, writing only the cells each frame changes.
+
+    Frames keep the source's timing. When rendering falls behind, frames whose
+    display time has already passed are dropped. Returns playback statistics.
+    """
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    out.write((RESET + HIDE_CURSOR + CLEAR_SCREEN).encode())
+    prev = None
+    shown = dropped = written = 0
+    start = deadline = time.perf_counter()
+    try:
+        while True:
+            for frame, duration in iter_frames(source, raw_size, fps):
+                deadline += duration
+                if prev is not None and time.perf_counter() > deadline:
+                    dropped += 1
+                    continue
+                with STATS.stage("cells"):
+                    img = resize_for_halfblock(frame, width, resample)
+                    grid = quantize_grid(halfblock_grid(img), quantize, depth, dither)
+                with STATS.stage("encode"):
+                    data = encode_grid_diff(HALF_GLYPHS, grid, prev, depth=depth).encode()
+                with STATS.stage("write"):
+                    out.write(data)
+                    out.flush()
+                STATS.count("bytes", len(data))
+                written += len(data)
+                shown += 1
+                prev = grid
+                with STATS.stage("wait"):
+                    time.sleep(max(0.0, deadline - time.perf_counter()))
+            if not loop or raw_size or prev is None:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rows = prev[0].shape[0] if prev is not None else 0
+        out.write(f"{RESET}\x1b[{rows + 1};1H{SHOW_CURSOR}".encode())
+        out.flush()
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": shown,
+        "dropped": dropped,
+        "fps": shown / elapsed if elapsed else 0.0,
+        "bytes_per_frame": written / shown if shown else 0.0,
+    }
+
+
+# ============================================================
+# Render cache — keyed on source content plus render options
+# ============================================================
+
+RENDER_CACHE_VERSION = 1
+
+
+def cache_dir(name: str = "renders") -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ascii_art", name)
+
+
+def trim_dir(directory: str, suffixes: tuple[str, ...], max_bytes: int) -> None:
+    """Delete least recently used files until `directory` is back under 90% of max_bytes."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffixes):
+            st = entry.stat()
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        if total <= max_bytes * 0.9:
+            break
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        total -= size
+
+
+def source_id(source: str) -> tuple[str, bytes | None]:
+    """Identity of a source's content, plus its bytes if they had to be fetched.
+
+    Local files are identified by path, mtime and size without being read;
+    URLs are downloaded and hashed, so a changed image never hits a stale entry.
+    """
+    if is_url(source):
+        data, _ = FETCHER.get(source)
+        return "sha256:" + hashlib.sha256(data).hexdigest(), data
+    st = os.stat(source)
+    return f"file:{os.path.abspath(source)}:{st.st_mtime_ns}:{st.st_size}", None
+
+
+class RenderCache:
+    """Two-level LRU: recent entries in memory, everything else as files in `directory`.
+
+    Values are rendered text (.ans) or resized pixel buffers (.npy). The
+    directory is trimmed, least recently used first, when it grows past
+    max_bytes; memory holds at most max_entries values and max_memory bytes,
+    and values over a quarter of that stay on disk only. Hit and miss counts
+    cover every lookup.
+    """
+
+    def __init__(
+        self,
+        directory: str | None,
+        max_bytes: int = 64 << 20,
+        max_entries: int = 64,
+        pixels: bool = True,
+        max_memory: int = 16 << 20,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.pixels = pixels
+        self.memory: OrderedDict[str, str | np.ndarray] = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts: object) -> str:
+        return hashlib.sha256(repr((RENDER_CACHE_VERSION, *parts)).encode()).hexdigest()
+
+    def get(self, name: str) -> str | np.ndarray | None:
+        with STATS.stage("cache"):
+            return self._get(name)
+
+    def _get(self, name: str) -> str | np.ndarray | None:
+        value = self.memory.get(name)
+        if value is not None:
+            self.memory.move_to_end(name)
+            self.hits += 1
+            return value
+        if self.directory:
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".npy"):
+                    value = np.load(path)
+                else:
+                    with open(path, encoding="utf-8") as f:
+                        value = f.read()
+                os.utime(path)  # recently used: evicted last
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                self._remember(name, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, name: str, value: str | np.ndarray) -> None:
+        self._remember(name, value)
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with STATS.stage("cache"), open(tmp, "wb") as f:
+                if isinstance(value, np.ndarray):
+                    np.save(f, value)
+                else:
+                    f.write(value.encode())
+            os.replace(tmp, path)
+            trim_dir(self.directory, (".ans", ".npy"), self.max_bytes)
+        except OSError:
+            pass  # the cache is best-effort
+
+    def record(self, name: str, lines: Iterable[str]) -> Iterator[str]:
+        """Pass lines through, writing them to the cache file as they're produced.
+
+        The text is collected for memory only while it's under the per-entry
+        memory limit, and isn't cached at all once it's over half of max_bytes.
+        """
+        lines = iter(lines)
+        path = os.path.join(self.directory, name) if self.directory else None
+        # Per thread as well as per process: server threads may render the same entry
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp" if path else None
+        f: BinaryIO | None = None
+        if tmp:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                f = open(tmp, "wb")
+            except OSError:
+                pass  # the cache is best-effort
+        kept: list[str] | None = []
+        size = 0
+        sep = b""
+        try:
+            for line in lines:
+                yield line
+                data = sep + line.encode()
+                sep = b"\n"
+                size += len(data)
+                if kept is not None:
+                    kept.append(line)
+                    if size > self.max_memory // 4:
+                        kept = None
+                if f is not None:
+                    try:
+                        if size > self.max_bytes // 2:
+                            raise OSError("too big to cache")
+                        with STATS.stage("cache"):
+                            f.write(data)
+                    except OSError:
+                        f.close()
+                        f = None
+                if kept is None and f is None:
+                    yield from lines
+                    return
+            if kept is not None:
+                self._remember(name, "\n".join(kept))
+            if f is not None:
+                done, f = f, None
+                try:
+                    with STATS.stage("cache"):
+                        done.close()
+                        os.replace(tmp, path)
+                        trim_dir(self.directory, (".ans", ".npy"), self.max_bytes)
+                except OSError:
+                    pass
+        finally:
+            if f is not None:
+                f.close()
+            if tmp:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp)
+
+    @staticmethod
+    def _size(value: str | np.ndarray) -> int:
+        return value.nbytes if isinstance(value, np.ndarray) else sys.getsizeof(value)
+
+    def _remember(self, name: str, value: str | np.ndarray) -> None:
+        old = self.memory.pop(name, None)
+        if old is not None:
+            self.memory_bytes -= self._size(old)
+        size = self._size(value)
+        if size > self.max_memory // 4:
+            return
+        self.memory[name] = value
+        self.memory_bytes += size
+        while len(self.memory) > self.max_entries or self.memory_bytes > self.max_memory:
+            self.memory_bytes -= self._size(self.memory.popitem(last=False)[1])
+
+    def counts(self) -> tuple[int, int, int]:
+        return self.hits, self.disk_hits, self.misses
+
+    def add_counts(self, counts: tuple[int, int, int]) -> None:
+        """Fold in lookups made elsewhere (e.g. by batch workers)."""
+        self.hits += counts[0]
+        self.disk_hits += counts[1]
+        self.misses += counts[2]
+
+    def summary(self) -> str:
+        return (
+            f"render cache: {self.hits + self.disk_hits} hits ({self.disk_hits} from disk), "
+            f"{self.misses} misses"
+        )
+
+
+RENDER_CACHE: RenderCache | None = RenderCache(cache_dir())
+
+
+def configure_cache(enabled: bool = True, max_mb: float = 64) -> None:
+    """Set up the module's render cache (also used as the batch pool initializer)."""
+    global RENDER_CACHE
+    RENDER_CACHE = RenderCache(cache_dir(), max_bytes=int(max_mb * (1 << 20))) if enabled else None
+
+
+# ============================================================
+# Downloads — pooled keep-alive connections, revalidated on reuse
+# ============================================================
+
+USER_AGENT = "Mozilla/5.0"
+FETCH_CHUNK = 64 << 10
+MAX_REDIRECTS = 5
+# URLs downloaded ahead of the one being rendered
+PREFETCH_AHEAD = 8
+
+
+class Fetcher:
+    """Concurrent HTTP(S) downloads over kept-alive connections.
+
+    At most `per_host` requests run against one host at a time, each socket
+    operation times out after `timeout` seconds, and bodies larger than
+    max_bytes are refused. Responses carrying an ETag or Last-Modified are
+    kept in `cache_dir` and revalidated with a conditional request, so an
+    unchanged image costs a 304 instead of a download.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 15,
+        max_bytes: int = 64 << 20,
+        per_host: int = 4,
+        workers: int = 8,
+        cache_dir: str | None = None,
+        cache_bytes: int = 64 << 20,
+    ):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.per_host = per_host
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.cache_bytes = cache_bytes
+        self.lock = threading.Lock()
+        self.idle: dict[tuple, list[http.client.HTTPConnection]] = {}
+        self.slots: dict[tuple, threading.BoundedSemaphore] = {}
+        self.pending: dict[str, Future] = {}
+        self.pool: ThreadPoolExecutor | None = None
+
+    def prefetch(self, urls: Iterable[str]) -> None:
+        """Start downloading `urls` in the background; get() picks the results up."""
+        with self.lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fetch")
+            for url in urls:
+                if url not in self.pending:
+                    self.pending[url] = self.pool.submit(self._download, url, False)
+
+    def put(self, url: str, body: bytes) -> None:
+        """Hand over a body downloaded elsewhere (e.g. by the parent of a batch worker)."""
+        future: Future = Future()
+        future.set_result((body, None))
+        with self.lock:
+            self.pending[url] = future
+
+    def get(self, url: str, parse: bool = False) -> tuple[bytes, Image.Image | None]:
+        """(body, image) for `url`. With parse, the image is decoded while it downloads."""
+        with self.lock:
+            future = self.pending.pop(url, None)
+        with STATS.stage("fetch"):
+            if future is None:
+                return self._download(url, parse)
+            body, _ = future.result()
+        return body, Image.open(io.BytesIO(body)) if parse else None
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle.clear()
+
+    def _download(self, url: str, parse: bool) -> tuple[bytes, Image.Image | None]:
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            host = (parts.scheme, parts.hostname, parts.port)
+            target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+            cached = self._cache_load(url)
+            if cached and len(cached["body"]) > self.max_bytes:
+                cached = None
+            if cached:
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            with self._slot(host):
+                conn, resp = self._request(host, target, headers)
+                try:
+                    if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+                        resp.read()
+                        url = urllib.parse.urljoin(url, resp.getheader("Location"))
+                        continue
+                    if resp.status == 304 and cached:
+                        resp.read()
+                        body = cached["body"]
+                        return body, Image.open(io.BytesIO(body)) if parse else None
+                    if resp.status != 200:
+                        resp.read()
+                        raise OSError(f"HTTP {resp.status} {resp.reason}: {url}")
+                    body, image = self._read(resp, url, parse)
+                finally:
+                    self._release(host, conn, resp)
+
+            etag, last_modified = resp.getheader("ETag"), resp.getheader("Last-Modified")
+            if etag or last_modified:
+                self._cache_store(url, {"etag": etag, "last_modified": last_modified, "body": body})
+            return body, image
+        raise OSError(f"too many redirects: {url}")
+
+    def _slot(self, host: tuple) -> threading.BoundedSemaphore:
+        with self.lock:
+            if host not in self.slots:
+                self.slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.slots[host]
+
+    def _request(
+        self, host: tuple, target: str, headers: dict
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a GET on an idle kept-alive connection, or a new one if it was dropped."""
+        with self.lock:
+            conns = self.idle.get(host)
+            conn = conns.pop() if conns else None
+        if conn is not None:
+            try:
+                conn.request("GET", target, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                conn.close()  # the server closed it while idle
+        scheme, hostname, port = host
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(hostname, port, timeout=self.timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            return conn, conn.getresponse()
+        except BaseException:
+            conn.close()
+            raise
+
+    def _release(self, host: tuple, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        if resp.isclosed() and not resp.will_close:
+            with self.lock:
+                self.idle.setdefault(host, []).append(conn)
+        else:
+            conn.close()
+
+    def _read(self, resp: http.client.HTTPResponse, url: str, parse: bool) -> tuple[bytes, Image.Image | None]:
+        """Read the body in chunks, feeding an ImageFile.Parser as it arrives."""
+        length = resp.getheader("Content-Length")
+        if length and int(length) > self.max_bytes:
+            raise ValueError(f"{url}: {int(length)} bytes is over the {self.max_bytes} byte limit")
+        parser = ImageFile.Parser() if parse else None
+        chunks = []
+        size = 0
+        while chunk := resp.read(FETCH_CHUNK):
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise ValueError(f"{url}: over the {self.max_bytes} byte limit")
+            chunks.append(chunk)
+            if parser:
+                parser.feed(chunk)
+        return b"".join(chunks), parser.close() if parser else None
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".http")
+
+    def _cache_load(self, url: str) -> dict | None:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(url), "rb") as f:
+                entry = pickle.load(f)
+            os.utime(self._cache_path(url))
+        except Exception:
+            return None  # missing or unreadable
+        return entry
+
+    def _cache_store(self, url: str, entry: dict) -> None:
+        if not self.cache_dir:
+            return
+        path = self._cache_path(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            trim_dir(self.cache_dir, (".http",), self.cache_bytes)
+        except OSError:
+            pass  # the cache is best-effort
+
+
+FETCHER = Fetcher(cache_dir=cache_dir("http"))
+
+
+def configure_fetcher(timeout: float = 15, max_mb: float = 64) -> None:
+    global FETCHER
+    FETCHER = Fetcher(
+        timeout=timeout,
+        max_bytes=int(max_mb * (1 << 20)),
+        cache_dir=cache_dir("http") if RENDER_CACHE else None,
+    )
+
+
+# ============================================================
+# Batch conversion
+# ============================================================
+
+
+def _render_file(
+    source: str,
+    width: int,
+    quantize: int,
+    resample: str,
+    depth: int,
+    dither: str,
+    out_path: str | None,
+    body: bytes | None = None,
+) -> tuple[str | None, tuple, dict | None]:
+    """Worker entry point: render one image, or write it to out_path if given.
+
+    `body` is the already-downloaded content of a URL source. Also returns the
+    render cache lookups it made and, with --stats, its stage timings, for the
+    parent's totals.
+    """
+    STATS.reset()
+    if body is not None:
+        FETCHER.put(source, body)
+    before = RENDER_CACHE.counts() if RENDER_CACHE else (0, 0, 0)
+    text = image_to_halfblock(source, width, quantize, resample, depth, dither)
+    counts = tuple(a - b for a, b in zip(RENDER_CACHE.counts(), before)) if RENDER_CACHE else before
+    if out_path is not None:
+        with STATS.stage("write"), open(out_path, "w", encoding="utf-8") as f:
+            STATS.count("bytes", f.write(text + "\n"))
+        text = None
+    return text, counts, STATS.snapshot() if STATS.enabled else None
+
+
+def _init_worker(cache_enabled: bool, cache_mb: float, timeout: float, download_mb: float, stats: bool) -> None:
+    configure_cache(cache_enabled, cache_mb)
+    configure_fetcher(timeout, download_mb)
+    STATS.enabled = stats
+
+
+def output_paths(sources: list[str], out_dir: str) -> list[str]:
+    """<out_dir>/<name>.ans for each source, numbered when names collide."""
+    seen: dict[str, int] = {}
+    paths = []
+    for source in sources:
+        if is_url(source):
+            source = urllib.parse.urlparse(source).path
+        name = os.path.splitext(os.path.basename(source))[0] or "image"
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}-{seen[name]}"
+        paths.append(os.path.join(out_dir, f"{name}.ans"))
+    return paths
+
+
+def run_batch(
+    sources: list[str],
+    width: int,
+    quantize: int = 1,
+    resample: str = "quality",
+    jobs: int = 1,
+    out_dir: str | None = None,
+    depth: int = 24,
+    dither: str = "none",
+) -> list[tuple[str, str]]:
+    """Render sources in a process pool, printing results in input order.
+
+    At most 2 * jobs images are in flight at once, so memory stays bounded for
+    long lists. Failures are returned as (source, reason) instead of aborting.
+    """
+    targets = output_paths(sources, out_dir) if out_dir else [None] * len(sources)
+    headers = out_dir is None and len(sources) > 1
+    failures = []
+
+    def emit(source: str, future: Future) -> None:
+        try:
+            text, counts, stats = future.result()
+        except Exception as e:
+            failures.append((source, f"{type(e).__name__}: {e}"))
+            return
+        if RENDER_CACHE:
+            RENDER_CACHE.add_counts(counts)
+        if stats:
+            STATS.merge(stats)
+        if text is None:
+            return
+        if headers:
+            print(f"\n\x1b[1m--- {source} ---\x1b[0m\n")
+        with STATS.stage("write"):
+            print(text)
+        if STATS.enabled:
+            STATS.count("bytes", len(text.encode()) + 1)
+        if headers:
+            print()
+
+    config = (
+        RENDER_CACHE is not None,
+        RENDER_CACHE.max_bytes / (1 << 20) if RENDER_CACHE else 0,
+        FETCHER.timeout,
+        FETCHER.max_bytes / (1 << 20),
+        STATS.enabled,
+    )
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=config) as pool:
+        pending: deque[tuple[str, Future]] = deque()
+        for i, (source, target) in enumerate(zip(sources, targets)):
+            # URLs are downloaded here, concurrently and ahead of the workers
+            FETCHER.prefetch(url for url in sources[i : i + PREFETCH_AHEAD] if is_url(url))
+            try:
+                body = FETCHER.get(source)[0] if is_url(source) else None
+            except Exception as e:
+                future: Future = Future()
+                future.set_exception(e)
             else:
-                chars.append(f"{fg(r2, g2, b2)}\u2584{RESET}")
-        lines.append("".join(chars))
+                future = pool.submit(_render_file, source, width, quantize, resample, depth, dither, target, body)
+            pending.append((source, future))
+            if len(pending) >= 2 * jobs:
+                emit(*pending.popleft())
+        while pending:
+            emit(*pending.popleft())
+    return failures
+
 
-    return "\n".join(lines)
+def report_failures(failures: list[tuple[str, str]], total: int) -> None:
+    """Print (source, reason) failures to stderr and exit 1, if there were any."""
+    if failures:
+        print(f"\n{len(failures)} of {total} images failed:", file=sys.stderr)
+        for source, reason in failures:
+            print(f"  {source}: {reason}", file=sys.stderr)
+        sys.exit(1)
 
 
 def parse_width(spec: str) -> int:
@@ -77,17 +1432,95 @@ def parse_width(spec: str) -> int:
     return int(spec)
 
 
-if __name__ == "__main__":
+def main() -> None:
     p = argparse.ArgumentParser(description="Image to colored ASCII using half-block characters.")
     p.add_argument("images", nargs="+", help="Image file paths or URLs")
     p.add_argument("-w", "--width", default="100%", help='Width: columns (e.g. "200") or percent of terminal (e.g. "50%%"). Default: 100%%')
+    p.add_argument("-q", "--quantize", type=int, default=1, metavar="STEP",
+                   help="Snap colors to a grid of STEP per channel so near-identical neighbors share escapes (default: 1, exact)")
+    p.add_argument("--color-depth", type=int, choices=COLOR_DEPTHS, default=24,
+                   help="24-bit color (default), or the nearest of the terminal's 256 or 16 colors")
+    p.add_argument("--dither", choices=DITHER_MODES, default="none",
+                   help="With --color-depth 256/16: ordered (Bayer) or fs (Floyd-Steinberg) dithering")
+    p.add_argument("--resample", choices=RESAMPLE_MODES, default="quality",
+                   help="quality: exact LANCZOS from a lightly reduced decode (default); "
+                        "fast: decode JPEGs near the target size and box-reduce before LANCZOS")
+    p.add_argument("-j", "--jobs", type=int, default=1,
+                   help="Render images in N worker processes, printed in input order (default: 1)")
+    p.add_argument("-o", "--output-dir", metavar="DIR",
+                   help="Write each image to DIR/<name>.ans instead of stdout")
+    p.add_argument("--play", action="store_true",
+                   help="Play animated images (GIF/APNG/WebP) in place, redrawing only changed cells")
+    p.add_argument("--loop", action="store_true", help="With --play: repeat until interrupted")
+    p.add_argument("--raw", metavar="WxH",
+                   help='With --play: read raw RGB24 frames of this size (e.g. from ffmpeg; "-" for stdin)')
+    p.add_argument("--fps", type=float, default=25, help="With --raw: frame rate (default: 25)")
+    p.add_argument("--timeout", type=float, default=15, metavar="SECONDS",
+                   help="Network timeout for URLs (default: 15)")
+    p.add_argument("--max-download", type=float, default=64, metavar="MB",
+                   help="Refuse URLs larger than this (default: 64)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Don't read or write the render and download caches")
+    p.add_argument("--cache-size", type=float, default=64, metavar="MB",
+                   help="Size cap for the on-disk render cache (default: 64)")
+    p.add_argument("--cache-stats", action="store_true",
+                   help="Print render cache hits and misses to stderr when done")
+    p.add_argument("--stats", action="store_const", const="text",
+                   help="Print time per stage and cells, escapes and bytes written to stderr when done")
+    p.add_argument("--stats-json", dest="stats", action="store_const", const="json", help="Like --stats, as JSON")
+    p.add_argument("--profile", action="store_const", const="-",
+                   help="Run under cProfile and print the slowest functions to stderr")
+    p.add_argument("--profile-out", dest="profile", metavar="FILE",
+                   help="Like --profile, also saving the raw profile to FILE")
     args = p.parse_args()
+    with instrumented(args.stats, args.profile):
+        run(args)
+
 
+def run(args: argparse.Namespace) -> None:
     width = parse_width(args.width)
+    configure_cache(not args.no_cache, args.cache_size)
+    configure_fetcher(args.timeout, args.max_download)
 
-    for path in args.images:
-        if len(args.images) > 1:
-            print(f"\n\x1b[1m--- {path} ---\x1b[0m\n")
-        print(image_to_halfblock(path, width=width))
-        if len(args.images) > 1:
-            print()
+    if args.play:
+        raw_size = tuple(int(n) for n in args.raw.lower().split("x")) if args.raw else None
+        for path in args.images:
+            stats = play_halfblock(
+                path, width, args.quantize, args.resample, raw_size, args.fps, args.loop, args.color_depth, args.dither
+            )
+            print(
+                f"{path}: {stats['frames']} frames ({stats['dropped']} dropped), "
+                f"{stats['fps']:.1f} fps, {stats['bytes_per_frame']:.0f} bytes/frame",
+                file=sys.stderr,
+            )
+    elif args.jobs > 1 or args.output_dir:
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        failures = run_batch(
+            args.images, width, args.quantize, args.resample, args.jobs, args.output_dir, args.color_depth, args.dither
+        )
+        if args.cache_stats and RENDER_CACHE:
+            print(RENDER_CACHE.summary(), file=sys.stderr)
+        report_failures(failures, len(args.images))
+    else:
+        failures = []
+        for i, path in enumerate(args.images):
+            FETCHER.prefetch(url for url in args.images[i : i + PREFETCH_AHEAD] if is_url(url))
+            if len(args.images) > 1:
+                print(f"\n\x1b[1m--- {path} ---\x1b[0m\n")
+            try:
+                write_lines(iter_halfblock(path, width, args.quantize, args.resample, args.color_depth, args.dither))
+            except BrokenPipeError:
+                raise
+            except (OSError, ValueError) as e:
+                # A missing file, a failed download or one over --max-download: report it and go on
+                failures.append((path, f"{type(e).__name__}: {e}"))
+            if len(args.images) > 1:
+                print()
+        if args.cache_stats and RENDER_CACHE:
+            print(RENDER_CACHE.summary(), file=sys.stderr)
+        report_failures(failures, len(args.images))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,31 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["Pillow"]
+# dependencies = ["Pillow", "numpy"]
 # ///
 """Image to colored ASCII using quadrant block characters for 2x2 resolution per cell."""
 
 import argparse
+import contextlib
+import cProfile
+import functools
+import hashlib
+import http.client
 import io
+import json
+import math
 import os
+import pickle
+import pstats
 import sys
-import urllib.request
-from PIL import Image
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageFile, ImageSequence
 
 RESET = "\x1b[0m"
 
@@ -18,6 +33,34 @@ RESET = "\x1b[0m"
 # 1 = foreground color, 0 = background color
 QUADRANTS = " \u2597\u2596\u2584\u259d\u2590\u259e\u259f\u2598\u259a\u258c\u2599\u2580\u259c\u259b\u2588"
 
+# The other --mode glyph sets, indexed the same way: one bit per pixel in
+# reading order, the top-left pixel in the highest bit
+HALF_BLOCKS = " \u2584\u2580\u2588"
+
+
+def _sextant(mask):
+    # Unicode numbers sextant pixels 1-6 in reading order from the lowest bit,
+    # and leaves out the four patterns that already had a character
+    n = int(f"{mask:06b}"[::-1], 2)
+    existing = {0: " ", 21: "\u258c", 42: "\u2590", 63: "\u2588"}
+    return existing.get(n) or chr(0x1FB00 + n - 1 - (n > 21) - (n > 42))
+
+
+SEXTANTS = "".join(_sextant(mask) for mask in range(64))
+
+# Braille dot number of each pixel in reading order; dot n is bit n - 1.
+# The empty pattern is a plain space.
+_BRAILLE_DOTS = (1, 4, 2, 5, 3, 6, 7, 8)
+BRAILLE = " " + "".join(
+    chr(0x2800 + sum(1 << (dot - 1) for i, dot in enumerate(_BRAILLE_DOTS) if mask >> (7 - i) & 1))
+    for mask in range(1, 256)
+)
+
+# --mode: pixels per cell (columns, rows) and the glyphs for them
+CELL_SHAPES = {"half": (1, 2), "quad": (2, 2), "sextant": (2, 3), "braille": (2, 4)}
+CELL_GLYPHS = {"half": HALF_BLOCKS, "quad": QUADRANTS, "sextant": SEXTANTS, "braille": BRAILLE}
+CELL_MODES = tuple(CELL_SHAPES)
+
 
 def ansi_fg(r, g, b):
     return f"\x1b[38;2;{r};{g};{b}m"
@@ -27,12 +70,176 @@ def ansi_bg(r, g, b):
     return f"\x1b[48;2;{r};{g};{b}m"
 
 
+# How images are brought down to the target size:
+#   quality — JPEG draft keeps 2x headroom, then one exact LANCZOS pass
+#   fast    — JPEG draft to the target size, box-reduce, then LANCZOS on the last 2x
+RESAMPLE_MODES = ("quality", "fast")
+DRAFT_HEADROOM = {"quality": 2, "fast": 1}
+REDUCING_GAP = {"quality": None, "fast": 2.0}
+
+# Modes that resample correctly as-is and convert to RGB exactly afterwards;
+# anything else (palette, 1-bit, RGBA, CMYK...) is converted before resizing
+SHRINK_FIRST_MODES = ("RGB", "L")
+
+
+def is_url(source):
+    return source.startswith(("http://", "https://"))
+
+
 def load_image(source):
-    if source.startswith(("http://", "https://")):
-        req = urllib.request.Request(source, headers={"User-Agent": "Mozilla/5.0"})
-        data = urllib.request.urlopen(req).read()
-        return Image.open(io.BytesIO(data)).convert("RGB")
-    return Image.open(source).convert("RGB")
+    """Open a path, URL or already-fetched image bytes.
+
+    Files and bytes aren't decoded yet and keep their stored mode, so shrink()
+    can still pick a reduced JPEG decode and convert only the small result.
+    URLs are decoded as they download.
+    """
+    with STATS.stage("load"):
+        if isinstance(source, str) and is_url(source):
+            return FETCHER.get(source, parse=True)[1]
+        return Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def draft(img, size, resample="quality"):
+    """Let a JPEG decode straight down to near `size`; does nothing for other formats."""
+    width, height = size
+    headroom = DRAFT_HEADROOM[resample]
+    if img.format == "JPEG" and width * headroom < img.width:
+        # DCT-domain downscale by 1/2, 1/4 or 1/8 while decoding
+        img.draft(None, (width * headroom, height * headroom))
+
+
+def shrink(img, size, resample="quality"):
+    """Resize to `size` and convert to RGB, doing as little full-resolution work as possible."""
+    draft(img, size, resample)
+    with STATS.stage("decode"):
+        img.load()
+    with STATS.stage("resize"):
+        if img.mode not in SHRINK_FIRST_MODES:
+            img = img.convert("RGB")
+        img = img.resize(size, Image.LANCZOS, reducing_gap=REDUCING_GAP[resample])
+        return img.convert("RGB")
+
+
+# Sources with more pixels than this (after any JPEG draft) are shrunk a band
+# at a time, so memory follows the band size instead of the image size
+TILED_PIXELS = 1 << 26
+BAND_PIXELS = 1 << 24
+
+# Bytes per pixel of the uncompressed layouts read_rows() can decode in part
+RAW_BYTES = {
+    "L": 1, "P": 1, "LA": 2, "I;16": 2, "I;16B": 2, "RGB": 3, "BGR": 3,
+    "RGBA": 4, "BGRA": 4, "RGBX": 4, "BGRX": 4, "CMYK": 4,
+}
+
+# Pillow 11 expects decoder tiles as named tuples, older versions as plain ones
+TILE = getattr(ImageFile, "_Tile", lambda *tile: tile)
+
+# Source pixels LANCZOS reads on either side of each output pixel, at 1:1
+LANCZOS_REACH = 3
+
+
+def _row_tiles(img, top, bottom):
+    """Decoder tiles for rows [top, bottom) of an undecoded image, and the rows they cover.
+
+    A single uncompressed tile (BMP, PPM, plain TIFF) is cut down to exactly
+    those rows; a tiled layout keeps the tiles that overlap them. None for
+    anything that can only be decoded whole (PNG, compressed TIFF...).
+    """
+    tiles = [tuple(tile) for tile in img.tile]
+    if any(name != "raw" for name, *_ in tiles):
+        return None
+    if len(tiles) == 1:
+        _, extents, offset, args = tiles[0]
+        args = (args,) if isinstance(args, str) else tuple(args)
+        rawmode, stride, orientation = args + (0, 1)[len(args) - 1 :]
+        if tuple(extents) != (0, 0, *img.size) or rawmode not in RAW_BYTES:
+            return None
+        stride = stride or img.width * RAW_BYTES[rawmode]
+        # Bottom-up files store the last row first
+        first = top if orientation > 0 else img.height - bottom
+        tile = ("raw", (0, 0, img.width, bottom - top), offset + first * stride, (rawmode, stride, orientation))
+        return [tile], top, bottom
+    tiles = [tile for tile in tiles if tile[1][1] < bottom and tile[1][3] > top]
+    first = min(tile[1][1] for tile in tiles)
+    last = max(tile[1][3] for tile in tiles)
+    tiles = [(name, (x0, y0 - first, x1, y1 - first), offset, args) for name, (x0, y0, x1, y1), offset, args in tiles]
+    return tiles, first, last
+
+
+def needs_bands(img, size, resample="quality"):
+    """Whether `img` is big enough to shrink a band at a time, and stored so it can be.
+
+    Applies the JPEG draft first. Formats that can only be decoded whole gain
+    nothing from bands, so they go through shrink() however big they are.
+    """
+    draft(img, size, resample)
+    if img.width * img.height <= TILED_PIXELS or not getattr(img, "filename", None):
+        return False
+    return _row_tiles(img, 0, 1) is not None
+
+
+def read_rows(img, top, bottom):
+    """Rows [top, bottom) of `img`, decoding only those where the file allows.
+
+    Files in a layout _row_tiles() understands are reopened with just the
+    needed tiles; anything else is decoded whole, once, and cropped.
+    """
+    path = getattr(img, "filename", None)
+    found = _row_tiles(img, top, bottom) if path and img.tile else None
+    if found is not None:
+        tiles, first, last = found
+        try:
+            part = Image.open(path)
+            # Decoding fills an image of this size; TIFF keeps its own copy of it
+            part._size = (img.width, last - first)
+            if hasattr(part, "_tile_size"):
+                part._tile_size = part._size
+            part.tile = [TILE(*tile) for tile in tiles]
+            part.load()
+        except (OSError, ValueError, SyntaxError):
+            pass  # not what the header suggested after all: decode it whole
+        else:
+            if (first, last) == (top, bottom):
+                return part
+            return part.crop((0, top - first, img.width, bottom - first))
+    img.load()
+    return img.crop((0, top, img.width, bottom))
+
+
+def shrink_bands(img, size, resample="quality", band_pixels=BAND_PIXELS, step=2):
+    """shrink() for huge sources: yield the result a multiple of `step` rows at a time.
+
+    Each band covers about `band_pixels` source pixels and is resampled from
+    just those rows plus the filter's reach on either side, at the same
+    sample positions as a whole-image resize, so bands join without seams.
+    """
+    width, height = size
+    draft(img, size, resample)
+    scale = img.height / height
+    rows = max(step, int(band_pixels / img.width / scale) // step * step)
+    reach = math.ceil(LANCZOS_REACH * max(scale, 1.0)) + 1
+    # --resample fast box-reduces first; do it here, in blocks lined up with
+    # the ones Image.resize() would use on the whole image
+    gap = REDUCING_GAP[resample]
+    block = (int(img.width / width / gap) or 1, int(scale / gap) or 1) if gap else (1, 1)
+    for y0 in range(0, height, rows):
+        y1 = min(y0 + rows, height)
+        top = max(0, int(y0 * scale) - reach)
+        top -= top % block[1]
+        bottom = min(img.height, math.ceil(y1 * scale) + reach)
+        bottom = min(img.height, bottom + -bottom % block[1])
+        with STATS.stage("decode"):
+            part = read_rows(img, top, bottom)
+        with STATS.stage("resize"):
+            if part.mode not in SHRINK_FIRST_MODES:
+                part = part.convert("RGB")
+            box = (0, y0 * scale - top, img.width, y1 * scale - top)
+            if block != (1, 1):
+                part = part.reduce(block)
+                box = (0, box[1] / block[1], img.width / block[0], box[3] / block[1])
+            part = part.resize((width, y1 - y0), Image.LANCZOS, box=box)
+            part = part.convert("RGB")
+        yield part
 
 
 def dist_sq(c1, c2):
@@ -44,24 +251,30 @@ def avg_color(colors):
     return tuple(sum(c[i] for c in colors) // n for i in range(3))
 
 
-def image_to_quadblock(source, width=120):
-    img = load_image(source)
-
-    # Each character cell covers a 2x2 pixel block
-    px_w = width * 2
+def cell_size(img, width, mode="quad"):
+    # Each character cell covers a CELL_SHAPES block of pixels
+    cols, rows = CELL_SHAPES[mode]
     aspect = img.height / img.width
-    # Terminal cells are ~2:1 (tall:wide). Since we consume 2x2 pixels per cell,
-    # horizontal and vertical scaling cancel, but we still need the cell aspect fix.
-    px_h = int(px_w * aspect * 0.5)
-    if px_h % 2:
-        px_h += 1
+    # Terminal cells are ~2:1 (tall:wide), so an image `width` cells wide is
+    # width * aspect / 2 cells tall, rounded up (as half and quad blocks always have)
+    lines = int(width * aspect)
+    if lines % 2:
+        lines += 1
+    return width * cols, lines // 2 * rows
+
+
+def resize_for_quadblock(img, width, resample="quality", mode="quad"):
+    return shrink(img, cell_size(img, width, mode), resample)
 
-    img = img.resize((px_w, px_h), Image.LANCZOS)
+
+def quadblock_cells_scalar(img):
+    """Reference per-cell implementation of fit_cells() for 2x2 blocks, kept to validate it."""
+    px_w, px_h = img.size
     px = img.load()
 
-    lines = []
+    mask_rows, fg_rows, bg_rows = [], [], []
     for y in range(0, px_h, 2):
-        chars = []
+        masks, fgs, bgs = [], [], []
         for x in range(0, px_w, 2):
             # Gather 2x2 block: TL(bit3), TR(bit2), BL(bit1), BR(bit0)
             x1 = min(x + 1, px_w - 1)
@@ -80,7 +293,9 @@ def image_to_quadblock(source, width=120):
             if max_d < 100:
                 # Nearly uniform — single color full block
                 c = avg_color(block)
-                chars.append(f"{ansi_fg(*c)}\u2588{RESET}")
+                masks.append(0b1111)
+                fgs.append(c)
+                bgs.append(c)
                 continue
 
             # Mini k-means: 2 iterations to settle centroids
@@ -100,16 +315,1250 @@ def image_to_quadblock(source, width=120):
                 if dist_sq(p, ca) <= dist_sq(p, cb):
                     mask |= 1 << (3 - i)
 
-            if mask == 0b1111:
-                chars.append(f"{ansi_fg(*ca)}\u2588{RESET}")
-            elif mask == 0:
-                chars.append(f"{ansi_fg(*cb)}\u2588{RESET}")
+            if mask == 0:
+                masks.append(0b1111)
+                fgs.append(cb)
+            else:
+                masks.append(mask)
+                fgs.append(ca)
+            bgs.append(cb)
+
+        mask_rows.append(masks)
+        fg_rows.append(fgs)
+        bg_rows.append(bgs)
+
+    return np.array(mask_rows), np.array(fg_rows), np.array(bg_rows)
+
+
+# Color spaces the two colors of a cell are fitted in, and the default
+# --uniform distance in each: cells whose pixels are all closer than this are
+# drawn solid. 10 in RGB is the original fixed threshold (squared distance
+# under 100); 3 in CIELAB is about one just-noticeable difference.
+COLOR_SPACES = ("rgb", "lab")
+UNIFORM_DISTANCE = {"rgb": 10, "lab": 3}
+
+# sRGB -> CIELAB (D65). The sRGB transfer curve is a lookup per 8-bit value,
+# so converting an image is a table lookup, one 3x3 product and a cube root.
+_SRGB_LINEAR = (lambda v: np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4))(
+    np.arange(256) / 255
+).astype(np.float32)
+_RGB_TO_XYZ = np.array([[0.4124, 0.3576, 0.1805], [0.2126, 0.7152, 0.0722], [0.0193, 0.1192, 0.9505]])
+_XYZ_SCALED = (_RGB_TO_XYZ / _RGB_TO_XYZ.sum(axis=1, keepdims=True)).T.astype(np.float32)  # white -> (1, 1, 1)
+_LAB_EPSILON = (6 / 29) ** 3
+
+
+def srgb_to_lab(rgb):
+    """CIELAB float32 values for an (..., 3) uint8 sRGB array."""
+    xyz = _SRGB_LINEAR[rgb] @ _XYZ_SCALED
+    f = np.where(xyz > _LAB_EPSILON, np.cbrt(xyz), xyz * np.float32(841 / 108) + np.float32(4 / 29))
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def _channel_blocks(a, shape):
+    """(h, w, 3) pixels as (3, rows, cols, pixels): one plane per channel, each block's pixels in reading order."""
+    cols, rows = shape
+    px_h, px_w = a.shape[:2]
+    a = a.reshape(px_h // rows, rows, px_w // cols, cols, 3)
+    return np.ascontiguousarray(a.transpose(4, 0, 2, 1, 3)).reshape(3, px_h // rows, px_w // cols, rows * cols)
+
+
+@functools.lru_cache(maxsize=None)
+def _cell_tables(n):
+    """Seed pair indices, in the order the scalar seed search visits them, and bit per pixel."""
+    pairs_i, pairs_j = np.triu_indices(n, 1)
+    return pairs_i, pairs_j, 1 << np.arange(n - 1, -1, -1)
+
+
+def _block_means(blocks, members, fallback):
+    """Per-cell mean of the member pixels (floored for integer pixels), or fallback where there are none."""
+    n = members.sum(axis=-1)
+    total = (blocks * members).sum(axis=-1)
+    count = np.maximum(n, 1)
+    mean = total // count if blocks.dtype.kind == "i" else total / count.astype(total.dtype)
+    return np.where(n > 0, mean, fallback)
+
+
+def _block_dist(blocks, color):
+    """Squared distance from each block pixel to its cell's color."""
+    d = blocks - color[..., None]
+    return (d * d).sum(axis=0)
+
+
+def fit_cells(img, shape=(2, 2), space="rgb", uniform=None):
+    """Fit two colors to every cols x rows block of pixels at once.
+
+    Returns (mask, fg, bg): an (rows, cols) glyph index array, one bit per
+    pixel set where it takes fg, and two (rows, cols, 3) color arrays. Solid
+    cells come back with every bit set (with the block average as fg when
+    its pixels are all within `uniform` of each other) and an unused bg. For
+    2x2 RGB blocks this is quadblock_cells_scalar().
+
+    With space="lab" the seeds, clusters and uniformity test use CIELAB
+    distances, which follow perceived differences (skin tones and dark
+    gradients don't band), and fg/bg are the RGB means of the two clusters.
+    """
+    n = shape[0] * shape[1]
+    pixels = np.asarray(img)
+    blocks = _channel_blocks(pixels.astype(np.int32), shape)
+    # Distances are measured between points: the pixels themselves, or their Lab values
+    points = blocks if space == "rgb" else _channel_blocks(srgb_to_lab(pixels), shape)
+    pairs_i, pairs_j, bits = _cell_tables(n)
+
+    # Seeds: the most distant pair (argmax keeps the first max, like the scalar scan)
+    diff = points[..., pairs_i] - points[..., pairs_j]
+    pair_d = (diff * diff).sum(axis=0)
+    best = pair_d.argmax(axis=-1)
+    max_d = np.take_along_axis(pair_d, best[..., None], axis=-1)[..., 0]
+    ca = np.take_along_axis(points, pairs_i[best][None, ..., None], axis=-1)[..., 0]
+    cb = np.take_along_axis(points, pairs_j[best][None, ..., None], axis=-1)[..., 0]
+
+    # Mini k-means: 2 iterations to settle centroids
+    for _ in range(2):
+        in_a = _block_dist(points, ca) <= _block_dist(points, cb)
+        ca, cb = _block_means(points, in_a, ca), _block_means(points, ~in_a, cb)
+
+    in_a = _block_dist(points, ca) <= _block_dist(points, cb)
+    mask = in_a @ bits
+    average = blocks.sum(axis=-1) // n
+    if points is not blocks:
+        ca, cb = _block_means(blocks, in_a, average), _block_means(blocks, ~in_a, average)
+
+    # Solid cells draw a full block in whichever color covers them
+    fg = np.where(mask == 0, cb, ca)
+    distance = UNIFORM_DISTANCE[space] if uniform is None else uniform
+    solid = max_d < distance * distance
+    mask[solid | (mask == 0)] = bits.sum()
+    fg[:, solid] = average[:, solid]
+    return mask, np.moveaxis(fg, 0, -1), np.moveaxis(cb, 0, -1)
+
+
+# ============================================================
+# Instrumentation — per-stage timers and counters for --stats / --profile
+# ============================================================
+
+# Functions shown in the --profile report
+PROFILE_LINES = 25
+
+
+class Stats:
+    """Wall time per named stage, plus counters such as cells and bytes.
+
+    Stages nest, and time spent in an inner stage isn't counted in the outer
+    one, so stage times add up to at most the wall time. While disabled (the
+    default) stage() returns a shared no-op and count() returns immediately.
+    Only the main thread records stages.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.times = {}
+        self.calls = {}
+        self.counters = {}
+        self._stack = []  # [name, start of its not yet counted time]
+
+    def stage(self, name):
+        return self._timed(name) if self.enabled else _NO_STAGE
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1])
+        entry = [name, now]
+        self._stack.append(entry)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._stack.pop()
+            self._add(name, now - entry[1])
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def _add(self, name, seconds):
+        self.times[name] = self.times.get(name, 0.0) + seconds
+
+    def snapshot(self):
+        return {
+            "stages": {name: {"seconds": t, "calls": self.calls.get(name, 0)} for name, t in self.times.items()},
+            "counters": dict(self.counters),
+        }
+
+    def merge(self, snapshot):
+        """Fold in a snapshot taken elsewhere (e.g. by a batch worker)."""
+        for name, stage in snapshot["stages"].items():
+            self._add(name, stage["seconds"])
+            self.calls[name] = self.calls.get(name, 0) + stage["calls"]
+        for name, n in snapshot["counters"].items():
+            self.count(name, n)
+
+    def report(self, fmt, wall, out=None):
+        """Print the stages (slowest first, then untimed "other") and counters as text or JSON."""
+        out = out or sys.stderr
+        if fmt == "json":
+            print(json.dumps({**self.snapshot(), "wall_seconds": wall}, indent=2), file=out)
+            return
+        other = max(0.0, wall - sum(self.times.values()))
+        rows = sorted(self.times.items(), key=lambda item: -item[1]) + [("other", other)]
+        print(f"{'stage':<10} {'time':>10} {'share':>6} {'calls':>7}", file=out)
+        for name, seconds in rows:
+            share = seconds / wall if wall else 0.0
+            print(f"{name:<10} {seconds * 1000:>8.1f}ms {share:>6.1%} {self.calls.get(name, ''):>7}", file=out)
+        print(f"{'total':<10} {wall * 1000:>8.1f}ms", file=out)
+        for name, n in self.counters.items():
+            print(f"{name:<10} {n:>10,}", file=out)
+
+
+STATS = Stats()
+_NO_STAGE = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def instrumented(stats=None, profile=None):
+    """Run the body with STATS enabled and/or under cProfile, reporting both to stderr at the end.
+
+    stats is "text" or "json". profile is "-" for the report alone, or a path
+    that also gets the raw profile (for pstats or snakeviz).
+    """
+    STATS.enabled = stats is not None
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+            if profile != "-":
+                profiler.dump_stats(profile)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        if stats:
+            STATS.report(stats, wall)
+
+
+# ============================================================
+# Palette output — 256 and 16 colors for terminals without true color
+# ============================================================
+
+COLOR_DEPTHS = (24, 256, 16)
+DITHER_MODES = ("none", "ordered", "fs")
+
+# xterm's color table: the 16 system colors at their xterm defaults, the
+# 6x6x6 cube and the gray ramp. 256-color output only picks from 16-255, since
+# terminals let users redefine the first 16.
+_LEVELS = np.array([0, 95, 135, 175, 215, 255])
+XTERM_COLORS = np.concatenate([
+    np.array([
+        (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+        (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+    ]),
+    np.stack(np.meshgrid(_LEVELS, _LEVELS, _LEVELS, indexing="ij"), axis=-1).reshape(-1, 3),
+    np.repeat(np.arange(8, 248, 10)[:, None], 3, axis=1),
+])
+PALETTE_RANGE = {256: (16, 256), 16: (0, 16)}
+
+# Per-channel weights for color distance, a cheap stand-in for perceived difference
+_DISTANCE_WEIGHTS = np.array([2, 4, 3])
+
+# Ordered dithering: 8x8 Bayer thresholds in [-0.5, 0.5), scaled by roughly
+# one palette step
+BAYER_8 = (np.array([
+    [0, 32, 8, 40, 2, 34, 10, 42], [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44, 4, 36, 14, 46, 6, 38], [60, 28, 52, 20, 62, 30, 54, 22],
+    [3, 35, 11, 43, 1, 33, 9, 41], [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47, 7, 39, 13, 45, 5, 37], [63, 31, 55, 23, 61, 29, 53, 21],
+]) + 0.5) / 64 - 0.5
+DITHER_SPREAD = {256: 40, 16: 128}
+
+
+@functools.lru_cache(maxsize=None)
+def palette_cube(depth):
+    """32x32x32 table of the nearest xterm color number for each 8x8x8 block of RGB space.
+
+    Built once per depth as one matrix product (about 25ms), so mapping a frame
+    is a single fancy-indexing lookup instead of a palette search per pixel.
+    """
+    lo, hi = PALETTE_RANGE[depth]
+    palette = XTERM_COLORS[lo:hi].astype(np.float32)
+    weights = _DISTANCE_WEIGHTS.astype(np.float32)
+    centers = (np.indices((32, 32, 32)).reshape(3, -1).T * 8 + 4).astype(np.float32)
+    # |c - p|^2 without the |c|^2 term, which is the same for every p
+    dist = (palette**2 * weights).sum(axis=1) - 2 * (centers * weights) @ palette.T
+    return (dist.argmin(axis=1) + lo).astype(np.uint8).reshape(32, 32, 32)
+
+
+def palette_numbers(rgb, depth, dither="none"):
+    """xterm color numbers for a (rows, cols, 3) array of colors."""
+    if dither == "fs":
+        return _floyd_steinberg(rgb, depth)
+    if dither == "ordered":
+        rows, cols = rgb.shape[:2]
+        threshold = BAYER_8[np.arange(rows)[:, None] % 8, np.arange(cols) % 8]
+        rgb = np.clip(rgb + threshold[..., None] * DITHER_SPREAD[depth], 0, 255).astype(np.intp)
+    cube = palette_cube(depth)
+    return cube[rgb[..., 0] >> 3, rgb[..., 1] >> 3, rgb[..., 2] >> 3].astype(np.intp)
+
+
+def _floyd_steinberg(rgb, depth):
+    """Error-diffusion mapping. Error moves along a row one pixel at a time, but
+    each row hands its errors down to the next in one vectorized step."""
+    cube = palette_cube(depth).ravel().tolist()
+    colors = XTERM_COLORS.tolist()
+    rows, cols = rgb.shape[:2]
+    out = np.empty((rows, cols), dtype=np.intp)
+    want = rgb.astype(np.float64)
+    for y in range(rows):
+        carry = (0.0, 0.0, 0.0)
+        numbers, errors = [], []
+        for pixel in want[y].tolist():
+            r, g, b = (min(max(c + e, 0.0), 255.0) for c, e in zip(pixel, carry))
+            n = cube[(int(r) >> 3) << 10 | (int(g) >> 3) << 5 | int(b) >> 3]
+            pr, pg, pb = colors[n]
+            errors.append((r - pr, g - pg, b - pb))
+            carry = ((r - pr) * 7 / 16, (g - pg) * 7 / 16, (b - pb) * 7 / 16)
+            numbers.append(n)
+        out[y] = numbers
+        if y + 1 < rows:
+            err = np.array(errors)
+            want[y + 1] += err * 5 / 16
+            want[y + 1, :-1] += err[1:] * 3 / 16  # down-left of the pixel to the right
+            want[y + 1, 1:] += err[:-1] / 16      # down-right of the pixel to the left
+    return out
+
+
+def sgr_params(numbers, depth, background=False):
+    """The last SGR parameter selecting each color: n for 38;5;n, or 30-37/90-97 (+10 for background)."""
+    if depth == 256:
+        return numbers
+    return np.where(numbers < 8, 30, 82) + numbers + (10 if background else 0)
+
+
+# ============================================================
+# Output encoding — emit SGR escapes only when the color changes
+# ============================================================
+
+# Background requirement per cell
+BG_DEFAULT = 0  # terminal default background must show
+BG_SET = 1      # cell needs its own background color
+BG_ANY = 2      # background is fully covered by the glyph (█)
+
+# Lines are assembled from a fixed table of string tokens, so each one is a
+# single "".join over an object array instead of one f-string per cell.
+# Tokens 0-255 are "n;", 256-511 are "nm" (the last parameter of an escape).
+# Each escape prefix below is also fused with each of those 512, so a cell's
+# escape starts with one token rather than two: a full 24-bit cell is 7
+# tokens instead of 9.
+_TOK_FG = 512
+_TOK_BG = 513
+_TOK_BG_NEXT = 514  # bg parameters continuing an fg escape: ESC[38;2;r;g;b;48;2;r;g;bm
+_TOK_BG_DEFAULT = 515
+_TOK_BG_DEFAULT_NEXT = 516
+_TOK_RESET = 517
+_TOK_NONE = 518
+_TOK_FG_256 = 519
+_TOK_BG_256 = 520
+_TOK_BG_NEXT_256 = 521
+_TOK_CSI = 522  # 16 colors: ESC[31;42m, the bg continuing with no prefix of its own
+_TOK_FUSED = 523  # prefix token t with parameter token p is _TOK_FUSED + (t - _TOK_FG) * 512 + p
+_TOK_GLYPHS = _TOK_FUSED + (_TOK_FUSED - _TOK_FG) * 512
+
+# (fg, bg, bg continuing an fg escape) prefixes per color depth
+_INTRO_TOKENS = {
+    24: (_TOK_FG, _TOK_BG, _TOK_BG_NEXT),
+    256: (_TOK_FG_256, _TOK_BG_256, _TOK_BG_NEXT_256),
+    16: (_TOK_CSI, _TOK_CSI, _TOK_NONE),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _token_table(glyphs):
+    params = [f"{i};" for i in range(256)] + [f"{i}m" for i in range(256)]
+    prefixes = ["\x1b[38;2;", "\x1b[48;2;", "48;2;", "\x1b[49m", "49m", RESET, ""]
+    prefixes += ["\x1b[38;5;", "\x1b[48;5;", "48;5;", "\x1b["]
+    return np.array(
+        params + prefixes + [prefix + param for prefix in prefixes for param in params] + list(glyphs), dtype=object
+    )
+
+
+def _fused(prefix, param):
+    return _TOK_FUSED + (prefix - _TOK_FG) * 512 + param
+
+
+def quantize_colors(rgb, step):
+    """Snap channels to the center of a grid of `step` so near colors share escapes."""
+    if step <= 1:
+        return rgb
+    return np.minimum(rgb // step * step + step // 2, 255)
+
+
+def _changed(on, code):
+    """Cells that are `on` and whose code differs from the state left by earlier cells.
+
+    The state at the start of each row is -1 (terminal default).
+    """
+    rows, cols = on.shape
+    last = np.maximum.accumulate(np.where(on, np.arange(cols), -1), axis=1)
+    prev = np.concatenate([np.full((rows, 1), -1), last[:, :-1]], axis=1)
+    prev_code = np.where(prev >= 0, np.take_along_axis(code, np.maximum(prev, 0), axis=1), -1)
+    return on & (code != prev_code)
+
+
+def encode_cells(glyphs, glyph_idx, fg_rgb, fg_on, bg_rgb, bg_mode, quantize=1, depth=24, dither="none"):
+    """Encode a grid of cells as lines of text with minimal SGR escapes.
+
+    glyph_idx indexes into `glyphs`; fg_on is False where the foreground is
+    irrelevant (spaces); bg_mode is one of BG_DEFAULT/BG_SET/BG_ANY. Escapes are
+    only emitted when the color in effect has to change, and every line that
+    set a color ends with a single RESET.
+
+    At depth 256 or 16 colors are mapped to the xterm palette, dithered as
+    asked; fg_rgb/bg_rgb may then also be (rows, cols) arrays of color numbers.
+    """
+    rows, cols = glyph_idx.shape
+    if depth == 24:
+        fg_rgb = quantize_colors(fg_rgb.astype(np.intp), quantize)
+        bg_rgb = quantize_colors(bg_rgb.astype(np.intp), quantize)
+        fg_code = (fg_rgb[..., 0] << 16) | (fg_rgb[..., 1] << 8) | fg_rgb[..., 2]
+        bg_code = np.where(bg_mode == BG_SET, (bg_rgb[..., 0] << 16) | (bg_rgb[..., 1] << 8) | bg_rgb[..., 2], -1)
+        fg_params = [fg_rgb[..., 0], fg_rgb[..., 1], fg_rgb[..., 2]]
+        bg_params = [bg_rgb[..., 0], bg_rgb[..., 1], bg_rgb[..., 2]]
+    else:
+        fg_code = fg_rgb if fg_rgb.ndim == 2 else palette_numbers(fg_rgb.astype(np.intp), depth, dither)
+        bg_num = bg_rgb if bg_rgb.ndim == 2 else palette_numbers(bg_rgb.astype(np.intp), depth, dither)
+        bg_code = np.where(bg_mode == BG_SET, bg_num, -1)
+        fg_params = [sgr_params(fg_code, depth)]
+        bg_params = [sgr_params(bg_num, depth, background=True)]
+    tok_fg, tok_bg, tok_bg_next = _INTRO_TOKENS[depth]
+
+    fg_emit = _changed(fg_on, fg_code)
+    bg_emit = _changed(bg_mode != BG_ANY, bg_code)
+    bg_set = bg_emit & (bg_mode == BG_SET)
+    bg_default = bg_emit & (bg_mode == BG_DEFAULT)
+
+    # Parameter tokens: the fg's last ends in ";" when a bg follows in the same escape
+    fg_tokens = [*fg_params[:-1], fg_params[-1] + np.where(bg_emit, 0, 256)]
+    bg_tokens = [*bg_params[:-1], bg_params[-1] + 256]
+    per_cell = len(fg_tokens) + len(bg_tokens) + 1
+
+    # Each line is its cells' tokens, then a RESET slot; unused slots stay empty
+    slots = np.full((rows, cols * per_cell + 1), _TOK_NONE, np.int16)
+    cells = slots[:, :-1].reshape(rows, cols, per_cell)
+    fill = functools.partial(np.copyto, casting="unsafe")
+    fill(cells[..., 0], _fused(tok_fg, fg_tokens[0]), where=fg_emit)
+    for i, token in enumerate(fg_tokens[1:], 1):
+        fill(cells[..., i], token, where=fg_emit)
+    at = len(fg_tokens)
+    fill(cells[..., at], _fused(np.where(fg_emit, tok_bg_next, tok_bg), bg_tokens[0]), where=bg_set)
+    fill(cells[..., at], np.where(fg_emit, _TOK_BG_DEFAULT_NEXT, _TOK_BG_DEFAULT), where=bg_default)
+    for i, token in enumerate(bg_tokens[1:], at + 1):
+        fill(cells[..., i], token, where=bg_set)
+    cells[..., -1] = glyph_idx + _TOK_GLYPHS
+    colored = (fg_emit | bg_emit).any(axis=1)
+    slots[colored, -1] = _TOK_RESET
+    if STATS.enabled:
+        STATS.count("cells", glyph_idx.size)
+        STATS.count("escapes", int(np.count_nonzero(fg_emit | bg_emit) + np.count_nonzero(colored)))
+    return ["".join(row) for row in _token_table(glyphs)[slots].tolist()]
+
+
+# Lines rendered per step when streaming
+BAND_ROWS = 32
+
+
+def quadblock_grid(img, scalar=False, mode="quad", space="rgb", uniform=None):
+    """encode_cells() inputs for an image sized by cell_size(), one CELL_SHAPES block per cell."""
+    mask, fg, bg = quadblock_cells_scalar(img) if scalar else fit_cells(img, CELL_SHAPES[mode], space, uniform)
+    solid = mask == len(CELL_GLYPHS[mode]) - 1
+    if mode == "braille":
+        # No braille pattern covers the whole cell: solid cells are a space on their color
+        mask = np.where(solid, 0, mask)
+        bg = np.where(solid[..., None], fg, bg)
+        return mask, fg, ~solid, bg, np.full(mask.shape, BG_SET)
+    fg_on = np.ones(mask.shape, dtype=bool)
+    bg_mode = np.where(solid, BG_ANY, BG_SET)
+    return mask, fg, fg_on, bg, bg_mode
+
+
+def quadblock_lines(img, quantize=1, scalar=False, depth=24, dither="none", mode="quad", space="rgb", uniform=None):
+    with STATS.stage("cells"):
+        grid = quadblock_grid(img, scalar, mode, space, uniform)
+    with STATS.stage("encode"):
+        return encode_cells(CELL_GLYPHS[mode], *grid, quantize=quantize, depth=depth, dither=dither)
+
+
+def iter_quadblock_lines(img, quantize=1, scalar=False, band=BAND_ROWS, depth=24, dither="none", mode="quad",
+                         space="rgb", uniform=None):
+    """Yield finished lines, rendering `band` lines at a time."""
+    px_w, px_h = img.size
+    step = band * CELL_SHAPES[mode][1]
+    for y in range(0, px_h, step):
+        band_img = img.crop((0, y, px_w, min(y + step, px_h)))
+        yield from quadblock_lines(band_img, quantize, scalar, depth, dither, mode, space, uniform)
+
+
+def iter_banded_quadblock_lines(img, size, quantize=1, scalar=False, resample="quality", depth=24, dither="none",
+                                mode="quad", space="rgb", uniform=None):
+    """iter_quadblock_lines() for a source too big to decode whole, shrinking it band by band."""
+    for band in shrink_bands(img, size, resample, step=CELL_SHAPES[mode][1]):
+        yield from quadblock_lines(band, quantize, scalar, depth, dither, mode, space, uniform)
+
+
+def _render_quadblock(source, width, quantize, scalar, resample, depth=24, dither="none", mode="quad",
+                      space="rgb", uniform=None):
+    """Cached text for `source`, or an iterator of lines that fills the cache as it runs."""
+    cache = RENDER_CACHE
+    if cache is None:
+        img = load_image(source)
+        size = cell_size(img, width, mode)
+        if needs_bands(img, size, resample):
+            return iter_banded_quadblock_lines(img, size, quantize, scalar, resample, depth, dither, mode, space,
+                                               uniform)
+        img = shrink(img, size, resample)
+        return iter_quadblock_lines(img, quantize, scalar, depth=depth, dither=dither, mode=mode, space=space,
+                                    uniform=uniform)
+
+    ident, data = source_id(source)
+    text_name = cache.key(ident, mode, width, resample, quantize, scalar, depth, dither, space, uniform) + ".ans"
+    text = cache.get(text_name)
+    if text is not None:
+        return text
+
+    # Resized pixels don't depend on quantize or depth, so they're shared across settings
+    # (RGB here, where img2ascii keeps RGBA for its half blocks)
+    pixels_name = cache.key(ident, mode, width, resample, "RGB") + ".npy"
+    pixels = cache.get(pixels_name) if cache.pixels else None
+    if pixels is not None:
+        img = Image.fromarray(pixels, "RGB")
+    else:
+        img = load_image(source if data is None else data)
+        size = cell_size(img, width, mode)
+        if needs_bands(img, size, resample):
+            # Too big to keep the resized pixels around for
+            lines = iter_banded_quadblock_lines(img, size, quantize, scalar, resample, depth, dither, mode, space,
+                                                uniform)
+            return cache.record(text_name, lines)
+        img = shrink(img, size, resample)
+        if cache.pixels:
+            cache.put(pixels_name, np.asarray(img))
+    lines = iter_quadblock_lines(img, quantize, scalar, depth=depth, dither=dither, mode=mode, space=space,
+                                 uniform=uniform)
+    return cache.record(text_name, lines)
+
+
+def iter_quadblock(source, width=120, quantize=1, scalar=False, resample="quality", depth=24, dither="none",
+                   mode="quad", space="rgb", uniform=None):
+    lines = _render_quadblock(source, width, quantize, scalar, resample, depth, dither, mode, space, uniform)
+    return iter(lines.split("\n") if lines else ()) if isinstance(lines, str) else lines
+
+
+def image_to_quadblock(source, width=120, quantize=1, scalar=False, resample="quality", depth=24, dither="none",
+                       mode="quad", space="rgb", uniform=None):
+    lines = _render_quadblock(source, width, quantize, scalar, resample, depth, dither, mode, space, uniform)
+    return lines if isinstance(lines, str) else "\n".join(lines)
+
+
+def write_lines(lines, out=None, flush_every=BAND_ROWS):
+    """Write lines to a binary stream as they arrive, flushing every `flush_every`."""
+    if out is None:
+        sys.stdout.flush()  # keep ordering with anything already print()ed
+        out = sys.stdout.buffer
+    written = 0
+    for i, line in enumerate(lines, 1):
+        with STATS.stage("write"):
+            data = line.encode()
+            out.write(data)
+            out.write(b"\n")
+            written += len(data) + 1
+            if i % flush_every == 0:
+                out.flush()
+    out.flush()
+    STATS.count("bytes", written)
+
+
+# ============================================================
+# Playback — animated images and raw video, redrawing only changed cells
+# ============================================================
+
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+CLEAR_SCREEN = "\x1b[2J"
+
+# Unchanged cells between two changed ones are redrawn instead of jumped over
+# when the gap is at most this wide (a cursor move costs ~8 bytes)
+MAX_GAP = 4
+
+
+def iter_frames(source, raw_size=None, fps=25):
+    """(frame, seconds to show it) for each frame of `source`.
+
+    Animated GIF/APNG/WebP frames come from Pillow with their own durations.
+    With raw_size, `source` is a stream of raw RGB24 frames ("-" for stdin),
+    e.g. from ffmpeg -f rawvideo -pix_fmt rgb24, shown at `fps`.
+    """
+    if raw_size:
+        frame_bytes = raw_size[0] * raw_size[1] * 3
+        with contextlib.ExitStack() as stack:
+            stream = sys.stdin.buffer if source == "-" else stack.enter_context(open(source, "rb"))
+            while len(data := stream.read(frame_bytes)) == frame_bytes:
+                yield Image.frombytes("RGB", raw_size, data), 1 / fps
+        return
+    # Frames are seeked through, which needs the whole file rather than a streamed decode
+    img = Image.open(io.BytesIO(FETCHER.get(source)[0])) if is_url(source) else load_image(source)
+    for frame in ImageSequence.Iterator(img):
+        # Browsers treat a zero delay as 100ms too
+        yield frame, (frame.info.get("duration") or 100) / 1000
+
+
+def quantize_grid(grid, quantize, depth=24, dither="none"):
+    """Snap a grid's colors up front so frames are compared as they will be drawn.
+
+    Below 24-bit the colors become palette numbers, dithered over the whole frame.
+    """
+    glyph_idx, fg_rgb, fg_on, bg_rgb, bg_mode = grid
+    if depth == 24:
+        fg_rgb = quantize_colors(fg_rgb.astype(np.intp), quantize)
+        bg_rgb = quantize_colors(bg_rgb.astype(np.intp), quantize)
+    else:
+        fg_rgb = palette_numbers(fg_rgb.astype(np.intp), depth, dither)
+        bg_rgb = palette_numbers(bg_rgb.astype(np.intp), depth, dither)
+    return glyph_idx, fg_rgb, fg_on, bg_rgb, bg_mode
+
+
+def _differs(a, b):
+    """Per-cell inequality of (rows, cols, 3) colors or (rows, cols) palette numbers."""
+    diff = a != b
+    return diff.any(axis=-1) if diff.ndim == 3 else diff
+
+
+def encode_grid_diff(glyphs, grid, prev, max_gap=MAX_GAP, depth=24):
+    """Escapes that update a screen showing `prev` (None: blank) to show `grid`.
+
+    Each run of changed cells is a cursor move followed by the run encoded
+    like a line, so it starts and ends in the default colors.
+    """
+    glyph_idx, fg_rgb, fg_on, bg_rgb, bg_mode = grid
+    if prev is None:
+        changed = np.ones(glyph_idx.shape, dtype=bool)
+    else:
+        p_glyph, p_fg, p_on, p_bg, p_mode = prev
+        changed = (
+            (glyph_idx != p_glyph)
+            | (fg_on != p_on)
+            | (bg_mode != p_mode)
+            | (fg_on & _differs(fg_rgb, p_fg))
+            | ((bg_mode == BG_SET) & _differs(bg_rgb, p_bg))
+        )
+    out = []
+    for row in np.flatnonzero(changed.any(axis=1)):
+        cols = np.flatnonzero(changed[row])
+        breaks = np.flatnonzero(np.diff(cols) > max_gap + 1)
+        for start, end in zip(cols[np.r_[0, breaks + 1]], cols[np.r_[breaks, -1]] + 1):
+            run = np.s_[row : row + 1, start:end]
+            out.append(f"\x1b[{row + 1};{start + 1}H")
+            cells = encode_cells(glyphs, glyph_idx[run], fg_rgb[run], fg_on[run], bg_rgb[run], bg_mode[run], depth=depth)
+            out.append(cells[0])
+    return "".join(out)
+
+
+def play_quadblock(source, width=120, quantize=1, scalar=False, resample="quality",
+                   raw_size=None, fps=25, loop=False, depth=24, dither="none", out=None, mode="quad",
+                   space="rgb", uniform=None):
+    """Play `source` from the top of the screen, writing only the cells each frame changes.
+
+    Frames keep the source's timing. When rendering falls behind, frames whose
+    display time has already passed are dropped. Returns playback statistics.
+    """
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    out.write((RESET + HIDE_CURSOR + CLEAR_SCREEN).encode())
+    prev = None
+    shown = dropped = written = 0
+    start = deadline = time.perf_counter()
+    try:
+        while True:
+            for frame, duration in iter_frames(source, raw_size, fps):
+                deadline += duration
+                if prev is not None and time.perf_counter() > deadline:
+                    dropped += 1
+                    continue
+                with STATS.stage("cells"):
+                    img = resize_for_quadblock(frame, width, resample, mode)
+                    grid = quantize_grid(quadblock_grid(img, scalar, mode, space, uniform), quantize, depth, dither)
+                with STATS.stage("encode"):
+                    data = encode_grid_diff(CELL_GLYPHS[mode], grid, prev, depth=depth).encode()
+                with STATS.stage("write"):
+                    out.write(data)
+                    out.flush()
+                STATS.count("bytes", len(data))
+                written += len(data)
+                shown += 1
+                prev = grid
+                with STATS.stage("wait"):
+                    time.sleep(max(0.0, deadline - time.perf_counter()))
+            if not loop or raw_size or prev is None:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rows = prev[0].shape[0] if prev is not None else 0
+        out.write(f"{RESET}\x1b[{rows + 1};1H{SHOW_CURSOR}".encode())
+        out.flush()
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": shown,
+        "dropped": dropped,
+        "fps": shown / elapsed if elapsed else 0.0,
+        "bytes_per_frame": written / shown if shown else 0.0,
+    }
+
+
+# ============================================================
+# Render cache — keyed on source content plus render options
+# ============================================================
+
+RENDER_CACHE_VERSION = 1
+
+
+def cache_dir(name="renders"):
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ascii_art", name)
+
+
+def trim_dir(directory, suffixes, max_bytes):
+    """Delete least recently used files until `directory` is back under 90% of max_bytes."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(suffixes):
+            st = entry.stat()
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    for _, size, path in sorted(entries):
+        if total <= max_bytes * 0.9:
+            break
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        total -= size
+
+
+def source_id(source):
+    """Identity of a source's content, plus its bytes if they had to be fetched.
+
+    Local files are identified by path, mtime and size without being read;
+    URLs are downloaded and hashed, so a changed image never hits a stale entry.
+    """
+    if is_url(source):
+        data, _ = FETCHER.get(source)
+        return "sha256:" + hashlib.sha256(data).hexdigest(), data
+    st = os.stat(source)
+    return f"file:{os.path.abspath(source)}:{st.st_mtime_ns}:{st.st_size}", None
+
+
+class RenderCache:
+    """Two-level LRU: recent entries in memory, everything else as files in `directory`.
+
+    Values are rendered text (.ans) or resized pixel buffers (.npy). The
+    directory is trimmed, least recently used first, when it grows past
+    max_bytes; memory holds at most max_entries values and max_memory bytes,
+    and values over a quarter of that stay on disk only. Hit and miss counts
+    cover every lookup.
+    """
+
+    def __init__(self, directory, max_bytes=64 << 20, max_entries=64, pixels=True, max_memory=16 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.pixels = pixels
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(repr((RENDER_CACHE_VERSION, *parts)).encode()).hexdigest()
+
+    def get(self, name):
+        with STATS.stage("cache"):
+            return self._get(name)
+
+    def _get(self, name):
+        value = self.memory.get(name)
+        if value is not None:
+            self.memory.move_to_end(name)
+            self.hits += 1
+            return value
+        if self.directory:
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".npy"):
+                    value = np.load(path)
+                else:
+                    with open(path, encoding="utf-8") as f:
+                        value = f.read()
+                os.utime(path)  # recently used: evicted last
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                self._remember(name, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, name, value):
+        self._remember(name, value)
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with STATS.stage("cache"), open(tmp, "wb") as f:
+                if isinstance(value, np.ndarray):
+                    np.save(f, value)
+                else:
+                    f.write(value.encode())
+            os.replace(tmp, path)
+            trim_dir(self.directory, (".ans", ".npy"), self.max_bytes)
+        except OSError:
+            pass  # the cache is best-effort
+
+    def record(self, name, lines):
+        """Pass lines through, writing them to the cache file as they're produced.
+
+        The text is collected for memory only while it's under the per-entry
+        memory limit, and isn't cached at all once it's over half of max_bytes.
+        """
+        lines = iter(lines)
+        path = os.path.join(self.directory, name) if self.directory else None
+        # Per thread as well as per process: server threads may render the same entry
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp" if path else None
+        f = None
+        if tmp:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                f = open(tmp, "wb")
+            except OSError:
+                pass  # the cache is best-effort
+        kept = []
+        size = 0
+        sep = b""
+        try:
+            for line in lines:
+                yield line
+                data = sep + line.encode()
+                sep = b"\n"
+                size += len(data)
+                if kept is not None:
+                    kept.append(line)
+                    if size > self.max_memory // 4:
+                        kept = None
+                if f is not None:
+                    try:
+                        if size > self.max_bytes // 2:
+                            raise OSError("too big to cache")
+                        with STATS.stage("cache"):
+                            f.write(data)
+                    except OSError:
+                        f.close()
+                        f = None
+                if kept is None and f is None:
+                    yield from lines
+                    return
+            if kept is not None:
+                self._remember(name, "\n".join(kept))
+            if f is not None:
+                done, f = f, None
+                try:
+                    with STATS.stage("cache"):
+                        done.close()
+                        os.replace(tmp, path)
+                        trim_dir(self.directory, (".ans", ".npy"), self.max_bytes)
+                except OSError:
+                    pass
+        finally:
+            if f is not None:
+                f.close()
+            if tmp:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp)
+
+    @staticmethod
+    def _size(value):
+        return value.nbytes if isinstance(value, np.ndarray) else sys.getsizeof(value)
+
+    def _remember(self, name, value):
+        old = self.memory.pop(name, None)
+        if old is not None:
+            self.memory_bytes -= self._size(old)
+        size = self._size(value)
+        if size > self.max_memory // 4:
+            return
+        self.memory[name] = value
+        self.memory_bytes += size
+        while len(self.memory) > self.max_entries or self.memory_bytes > self.max_memory:
+            self.memory_bytes -= self._size(self.memory.popitem(last=False)[1])
+
+    def counts(self):
+        return self.hits, self.disk_hits, self.misses
+
+    def add_counts(self, counts):
+        """Fold in lookups made elsewhere (e.g. by batch workers)."""
+        self.hits += counts[0]
+        self.disk_hits += counts[1]
+        self.misses += counts[2]
+
+    def summary(self):
+        return (
+            f"render cache: {self.hits + self.disk_hits} hits ({self.disk_hits} from disk), "
+            f"{self.misses} misses"
+        )
+
+
+RENDER_CACHE = RenderCache(cache_dir())
+
+
+def configure_cache(enabled=True, max_mb=64):
+    """Set up the module's render cache (also used as the batch pool initializer)."""
+    global RENDER_CACHE
+    RENDER_CACHE = RenderCache(cache_dir(), max_bytes=int(max_mb * (1 << 20))) if enabled else None
+
+
+# ============================================================
+# Downloads — pooled keep-alive connections, revalidated on reuse
+# ============================================================
+
+USER_AGENT = "Mozilla/5.0"
+FETCH_CHUNK = 64 << 10
+MAX_REDIRECTS = 5
+# URLs downloaded ahead of the one being rendered
+PREFETCH_AHEAD = 8
+
+
+class Fetcher:
+    """Concurrent HTTP(S) downloads over kept-alive connections.
+
+    At most `per_host` requests run against one host at a time, each socket
+    operation times out after `timeout` seconds, and bodies larger than
+    max_bytes are refused. Responses carrying an ETag or Last-Modified are
+    kept in `cache_dir` and revalidated with a conditional request, so an
+    unchanged image costs a 304 instead of a download.
+    """
+
+    def __init__(self, timeout=15, max_bytes=64 << 20, per_host=4, workers=8, cache_dir=None, cache_bytes=64 << 20):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.per_host = per_host
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.cache_bytes = cache_bytes
+        self.lock = threading.Lock()
+        self.idle = {}
+        self.slots = {}
+        self.pending = {}
+        self.pool = None
+
+    def prefetch(self, urls):
+        """Start downloading `urls` in the background; get() picks the results up."""
+        with self.lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fetch")
+            for url in urls:
+                if url not in self.pending:
+                    self.pending[url] = self.pool.submit(self._download, url, False)
+
+    def put(self, url, body):
+        """Hand over a body downloaded elsewhere (e.g. by the parent of a batch worker)."""
+        future = Future()
+        future.set_result((body, None))
+        with self.lock:
+            self.pending[url] = future
+
+    def get(self, url, parse=False):
+        """(body, image) for `url`. With parse, the image is decoded while it downloads."""
+        with self.lock:
+            future = self.pending.pop(url, None)
+        with STATS.stage("fetch"):
+            if future is None:
+                return self._download(url, parse)
+            body, _ = future.result()
+        return body, Image.open(io.BytesIO(body)) if parse else None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle.clear()
+
+    def _download(self, url, parse):
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            host = (parts.scheme, parts.hostname, parts.port)
+            target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+            cached = self._cache_load(url)
+            if cached and len(cached["body"]) > self.max_bytes:
+                cached = None
+            if cached:
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            with self._slot(host):
+                conn, resp = self._request(host, target, headers)
+                try:
+                    if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+                        resp.read()
+                        url = urllib.parse.urljoin(url, resp.getheader("Location"))
+                        continue
+                    if resp.status == 304 and cached:
+                        resp.read()
+                        body = cached["body"]
+                        return body, Image.open(io.BytesIO(body)) if parse else None
+                    if resp.status != 200:
+                        resp.read()
+                        raise OSError(f"HTTP {resp.status} {resp.reason}: {url}")
+                    body, image = self._read(resp, url, parse)
+                finally:
+                    self._release(host, conn, resp)
+
+            etag, last_modified = resp.getheader("ETag"), resp.getheader("Last-Modified")
+            if etag or last_modified:
+                self._cache_store(url, {"etag": etag, "last_modified": last_modified, "body": body})
+            return body, image
+        raise OSError(f"too many redirects: {url}")
+
+    def _slot(self, host):
+        with self.lock:
+            if host not in self.slots:
+                self.slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.slots[host]
+
+    def _request(self, host, target, headers):
+        """Send a GET on an idle kept-alive connection, or a new one if it was dropped."""
+        with self.lock:
+            conns = self.idle.get(host)
+            conn = conns.pop() if conns else None
+        if conn is not None:
+            try:
+                conn.request("GET", target, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                conn.close()  # the server closed it while idle
+        scheme, hostname, port = host
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = cls(hostname, port, timeout=self.timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            return conn, conn.getresponse()
+        except BaseException:
+            conn.close()
+            raise
+
+    def _release(self, host, conn, resp):
+        if resp.isclosed() and not resp.will_close:
+            with self.lock:
+                self.idle.setdefault(host, []).append(conn)
+        else:
+            conn.close()
+
+    def _read(self, resp, url, parse):
+        """Read the body in chunks, feeding an ImageFile.Parser as it arrives."""
+        length = resp.getheader("Content-Length")
+        if length and int(length) > self.max_bytes:
+            raise ValueError(f"{url}: {int(length)} bytes is over the {self.max_bytes} byte limit")
+        parser = ImageFile.Parser() if parse else None
+        chunks = []
+        size = 0
+        while chunk := resp.read(FETCH_CHUNK):
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise ValueError(f"{url}: over the {self.max_bytes} byte limit")
+            chunks.append(chunk)
+            if parser:
+                parser.feed(chunk)
+        return b"".join(chunks), parser.close() if parser else None
+
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + ".http")
+
+    def _cache_load(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(url), "rb") as f:
+                entry = pickle.load(f)
+            os.utime(self._cache_path(url))
+        except Exception:
+            return None  # missing or unreadable
+        return entry
+
+    def _cache_store(self, url, entry):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            trim_dir(self.cache_dir, (".http",), self.cache_bytes)
+        except OSError:
+            pass  # the cache is best-effort
+
+
+FETCHER = Fetcher(cache_dir=cache_dir("http"))
+
+
+def configure_fetcher(timeout=15, max_mb=64):
+    global FETCHER
+    FETCHER = Fetcher(
+        timeout=timeout,
+        max_bytes=int(max_mb * (1 << 20)),
+        cache_dir=cache_dir("http") if RENDER_CACHE else None,
+    )
+
+
+# ============================================================
+# Batch conversion
+# ============================================================
+
+
+def _render_file(source, width, quantize, scalar, resample, depth, dither, mode, space, uniform, out_path, body=None):
+    """Worker entry point: render one image, or write it to out_path if given.
+
+    `body` is the already-downloaded content of a URL source. Also returns the
+    render cache lookups it made and, with --stats, its stage timings, for the
+    parent's totals.
+    """
+    STATS.reset()
+    if body is not None:
+        FETCHER.put(source, body)
+    before = RENDER_CACHE.counts() if RENDER_CACHE else (0, 0, 0)
+    text = image_to_quadblock(source, width, quantize, scalar, resample, depth, dither, mode, space, uniform)
+    counts = tuple(a - b for a, b in zip(RENDER_CACHE.counts(), before)) if RENDER_CACHE else before
+    if out_path is not None:
+        with STATS.stage("write"), open(out_path, "w", encoding="utf-8") as f:
+            STATS.count("bytes", f.write(text + "\n"))
+        text = None
+    return text, counts, STATS.snapshot() if STATS.enabled else None
+
+
+def _init_worker(cache_enabled, cache_mb, timeout, download_mb, stats):
+    configure_cache(cache_enabled, cache_mb)
+    configure_fetcher(timeout, download_mb)
+    STATS.enabled = stats
+
+
+def output_paths(sources, out_dir):
+    """<out_dir>/<name>.ans for each source, numbered when names collide."""
+    seen = {}
+    paths = []
+    for source in sources:
+        if is_url(source):
+            source = urllib.parse.urlparse(source).path
+        name = os.path.splitext(os.path.basename(source))[0] or "image"
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}-{seen[name]}"
+        paths.append(os.path.join(out_dir, f"{name}.ans"))
+    return paths
+
+
+def run_batch(sources, width, quantize=1, scalar=False, resample="quality", jobs=1, out_dir=None,
+              depth=24, dither="none", mode="quad", space="rgb", uniform=None):
+    """Render sources in a process pool, printing results in input order.
+
+    At most 2 * jobs images are in flight at once, so memory stays bounded for
+    long lists. Failures are returned as (source, reason) instead of aborting.
+    """
+    targets = output_paths(sources, out_dir) if out_dir else [None] * len(sources)
+    headers = out_dir is None and len(sources) > 1
+    failures = []
+
+    def emit(source, future):
+        try:
+            text, counts, stats = future.result()
+        except Exception as e:
+            failures.append((source, f"{type(e).__name__}: {e}"))
+            return
+        if RENDER_CACHE:
+            RENDER_CACHE.add_counts(counts)
+        if stats:
+            STATS.merge(stats)
+        if text is None:
+            return
+        if headers:
+            print(f"\n\x1b[1m--- {source} ---\x1b[0m\n")
+        with STATS.stage("write"):
+            print(text)
+        if STATS.enabled:
+            STATS.count("bytes", len(text.encode()) + 1)
+        if headers:
+            print()
+
+    config = (
+        RENDER_CACHE is not None,
+        RENDER_CACHE.max_bytes / (1 << 20) if RENDER_CACHE else 0,
+        FETCHER.timeout,
+        FETCHER.max_bytes / (1 << 20),
+        STATS.enabled,
+    )
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=config) as pool:
+        pending = deque()
+        for i, (source, target) in enumerate(zip(sources, targets)):
+            # URLs are downloaded here, concurrently and ahead of the workers
+            FETCHER.prefetch(url for url in sources[i : i + PREFETCH_AHEAD] if is_url(url))
+            try:
+                body = FETCHER.get(source)[0] if is_url(source) else None
+            except Exception as e:
+                future = Future()
+                future.set_exception(e)
             else:
-                chars.append(f"{ansi_fg(*ca)}{ansi_bg(*cb)}{QUADRANTS[mask]}{RESET}")
+                future = pool.submit(
+                    _render_file, source, width, quantize, scalar, resample, depth, dither, mode, space, uniform,
+                    target, body,
+                )
+            pending.append((source, future))
+            if len(pending) >= 2 * jobs:
+                emit(*pending.popleft())
+        while pending:
+            emit(*pending.popleft())
+    return failures
 
-        lines.append("".join(chars))
 
-    return "\n".join(lines)
+def report_failures(failures, total):
+    """Print (source, reason) failures to stderr and exit 1, if there were any."""
+    if failures:
+        print(f"\n{len(failures)} of {total} images failed:", file=sys.stderr)
+        for source, reason in failures:
+            print(f"  {source}: {reason}", file=sys.stderr)
+        sys.exit(1)
 
 
 def parse_width(spec):
@@ -122,18 +1571,111 @@ def parse_width(spec):
     return int(spec)
 
 
-if __name__ == "__main__":
+def main():
     p = argparse.ArgumentParser(description="Image to colored ASCII using quadrant block characters.")
     p.add_argument("images", nargs="+", help="Image file paths or URLs")
     p.add_argument("-w", "--width", default="100%",
                    help='Width: columns (e.g. "200") or percent of terminal (e.g. "50%%"). Default: 100%%')
+    p.add_argument("--mode", choices=CELL_MODES, default="quad",
+                   help="Pixels per cell: half (1x2), quad (2x2, default), sextant (2x3) or braille (2x4)")
+    p.add_argument("--space", choices=COLOR_SPACES, default="rgb",
+                   help="Fit each cell's two colors by RGB distance (default) or perceptual CIELAB distance")
+    p.add_argument("--uniform", type=float, metavar="DIST",
+                   help="Draw a cell as one solid color when its pixels are all closer than DIST "
+                        "(default: 10 in RGB, 3 in Lab; lower keeps more detail, higher smooths noise)")
+    p.add_argument("--scalar", action="store_true",
+                   help="Use the slow per-cell reference engine instead of the vectorized one (quad only)")
+    p.add_argument("-q", "--quantize", type=int, default=1, metavar="STEP",
+                   help="Snap colors to a grid of STEP per channel so near-identical neighbors share escapes (default: 1, exact)")
+    p.add_argument("--color-depth", type=int, choices=COLOR_DEPTHS, default=24,
+                   help="24-bit color (default), or the nearest of the terminal's 256 or 16 colors")
+    p.add_argument("--dither", choices=DITHER_MODES, default="none",
+                   help="With --color-depth 256/16: ordered (Bayer) or fs (Floyd-Steinberg) dithering")
+    p.add_argument("--resample", choices=RESAMPLE_MODES, default="quality",
+                   help="quality: exact LANCZOS from a lightly reduced decode (default); "
+                        "fast: decode JPEGs near the target size and box-reduce before LANCZOS")
+    p.add_argument("-j", "--jobs", type=int, default=1,
+                   help="Render images in N worker processes, printed in input order (default: 1)")
+    p.add_argument("-o", "--output-dir", metavar="DIR",
+                   help="Write each image to DIR/<name>.ans instead of stdout")
+    p.add_argument("--play", action="store_true",
+                   help="Play animated images (GIF/APNG/WebP) in place, redrawing only changed cells")
+    p.add_argument("--loop", action="store_true", help="With --play: repeat until interrupted")
+    p.add_argument("--raw", metavar="WxH",
+                   help='With --play: read raw RGB24 frames of this size (e.g. from ffmpeg; "-" for stdin)')
+    p.add_argument("--fps", type=float, default=25, help="With --raw: frame rate (default: 25)")
+    p.add_argument("--timeout", type=float, default=15, metavar="SECONDS",
+                   help="Network timeout for URLs (default: 15)")
+    p.add_argument("--max-download", type=float, default=64, metavar="MB",
+                   help="Refuse URLs larger than this (default: 64)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="Don't read or write the render and download caches")
+    p.add_argument("--cache-size", type=float, default=64, metavar="MB",
+                   help="Size cap for the on-disk render cache (default: 64)")
+    p.add_argument("--cache-stats", action="store_true",
+                   help="Print render cache hits and misses to stderr when done")
+    p.add_argument("--stats", action="store_const", const="text",
+                   help="Print time per stage and cells, escapes and bytes written to stderr when done")
+    p.add_argument("--stats-json", dest="stats", action="store_const", const="json", help="Like --stats, as JSON")
+    p.add_argument("--profile", action="store_const", const="-",
+                   help="Run under cProfile and print the slowest functions to stderr")
+    p.add_argument("--profile-out", dest="profile", metavar="FILE",
+                   help="Like --profile, also saving the raw profile to FILE")
     args = p.parse_args()
+    if args.scalar and args.mode != "quad":
+        p.error("--scalar only applies to --mode quad")
+    if args.scalar and (args.space != "rgb" or args.uniform is not None):
+        p.error("--scalar is the fixed RGB reference engine; it takes no --space or --uniform")
+    if args.uniform is not None and args.uniform < 0:
+        p.error("--uniform must be 0 or more")
+    with instrumented(args.stats, args.profile):
+        run(args)
 
+
+def run(args):
     width = parse_width(args.width)
+    configure_cache(not args.no_cache, args.cache_size)
+    configure_fetcher(args.timeout, args.max_download)
 
-    for path in args.images:
-        if len(args.images) > 1:
-            print(f"\n\x1b[1m--- {path} ---\x1b[0m\n")
-        print(image_to_quadblock(path, width=width))
-        if len(args.images) > 1:
-            print()
+    if args.play:
+        raw_size = tuple(int(n) for n in args.raw.lower().split("x")) if args.raw else None
+        for path in args.images:
+            stats = play_quadblock(path, width, args.quantize, args.scalar, args.resample,
+                                   raw_size, args.fps, args.loop, args.color_depth, args.dither, mode=args.mode,
+                                   space=args.space, uniform=args.uniform)
+            print(
+                f"{path}: {stats['frames']} frames ({stats['dropped']} dropped), "
+                f"{stats['fps']:.1f} fps, {stats['bytes_per_frame']:.0f} bytes/frame",
+                file=sys.stderr,
+            )
+    elif args.jobs > 1 or args.output_dir:
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        failures = run_batch(args.images, width, args.quantize, args.scalar, args.resample, args.jobs,
+                             args.output_dir, args.color_depth, args.dither, args.mode, args.space, args.uniform)
+        if args.cache_stats and RENDER_CACHE:
+            print(RENDER_CACHE.summary(), file=sys.stderr)
+        report_failures(failures, len(args.images))
+    else:
+        failures = []
+        for i, path in enumerate(args.images):
+            FETCHER.prefetch(url for url in args.images[i : i + PREFETCH_AHEAD] if is_url(url))
+            if len(args.images) > 1:
+                print(f"\n\x1b[1m--- {path} ---\x1b[0m\n")
+            try:
+                write_lines(iter_quadblock(path, width, args.quantize, args.scalar, args.resample,
+                                           args.color_depth, args.dither, args.mode, args.space, args.uniform))
+            except BrokenPipeError:
+                raise
+            except (OSError, ValueError) as e:
+                # A missing file, a failed download or one over --max-download: report it and go on
+                failures.append((path, f"{type(e).__name__}: {e}"))
+            if len(args.images) > 1:
+                print()
+        if args.cache_stats and RENDER_CACHE:
+            print(RENDER_CACHE.summary(), file=sys.stderr)
+        report_failures(failures, len(args.images))
+
+
+if __name__ == "__main__":
+    main()